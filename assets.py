@@ -0,0 +1,54 @@
+import glob  # used for finding the image files
+import os  # used for the paths of the image files
+import threading  # used for loading the images in the background
+import pygame  # used for checking whether the display has been created
+from lib.picture import Picture  # used for the loaded images
+
+# The directory of the images used by the game
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "images")
+
+# The loaded pictures keyed by their file names (e.g. "menu_image.png") and the
+# names of the pictures that have been converted to the display format
+_pictures = {}
+_converted = set()
+# The lock that guards the pictures and the thread that preloads them
+_lock = threading.Lock()
+_loader = None
+
+
+# Function used for starting to load all the images of the game (images/*.png)
+# in a background thread, so that the screens do not wait for the disk
+def preload():
+    global _loader
+    if _loader is None:
+        _loader = threading.Thread(target=_load_all, daemon=True)
+        _loader.start()
+
+
+# Function used by the background thread for loading all the images
+def _load_all():
+    for path in sorted(glob.glob(os.path.join(IMAGE_DIR, "*.png"))):
+        _load(os.path.basename(path))
+
+
+# Function that loads the image with the given file name (if it has not been
+# loaded yet) and returns its picture
+def _load(name):
+    with _lock:
+        picture = _pictures.get(name)
+        if picture is None:
+            picture = Picture(os.path.join(IMAGE_DIR, name))
+            _pictures[name] = picture
+        return picture
+
+
+# Function that returns the shared picture of the image with the given file
+# name. The image is loaded only once (by preload or on the first request) and
+# it is converted to the display format once the display has been created. The
+# returned picture is shared, so it should not be modified.
+def picture(name):
+    picture = _load(name)
+    if name not in _converted and pygame.display.get_surface() is not None:
+        picture.convert()
+        _converted.add(name)
+    return picture
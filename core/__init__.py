@@ -0,0 +1,6 @@
+# Pure-logic core of the game (no drawing, no pygame/tkinter imports) so that
+# the rules can be imported and simulated on machines without a display
+from core.cell import EMPTY, new_tile_value, tile_number
+from core.grid import Grid, ClearResult, GravityResult, CascadeReport
+from core.piece import Piece
+from core.batch import BatchEnv
@@ -0,0 +1,203 @@
+import numpy as np  # the fundamental Python module for scientific computing
+
+from core.cell import EMPTY  # the value used for the empty cells
+from core.shapes import SHAPES, ROTATIONS, WALL_KICKS  # the tetromino shapes
+from core.board import merge_columns, clear_filled_rows  # vectorized updates
+from core.gravity import find_supported, drop_floating  # the gravity pass
+
+# The tetromino types in the order of their indexes in the batched environment
+TYPES = tuple(SHAPES)
+# The size n of the n x n tile matrix of each tetromino type
+SIZES = np.array([SHAPES[type][0] for type in TYPES])
+# OFFSETS[t, r, i] is the (dx, dy) offset of the i-th tile of the tetromino type
+# with index t after r clockwise rotations (see core/shapes.py)
+OFFSETS = np.array([[rotation.offsets for rotation in ROTATIONS[type]]
+                    for type in TYPES])
+# The wall kicks tried when rotating (the kicks that are not allowed for a type
+# are masked out by KICK_ALLOWED[t, k])
+KICKS = max(WALL_KICKS.values(), key=len)
+KICK_ALLOWED = np.array([[kick in WALL_KICKS[type] for kick in KICKS]
+                         for type in TYPES])
+
+
+# Class used for running many games in lockstep: the game grids of N games are
+# stored in one (N, grid_h, grid_w) array of tile values and the active
+# tetrominoes in parallel arrays, and each step applies one action to all the
+# games with vectorized NumPy operations (gym-style reset()/step(actions) API).
+# A step applies the actions and then moves all the tetrominoes down by one (auto
+# fall) like an iteration of the main game loop; the landed tetrominoes are
+# locked and the merges, row clears and drops are settled. Finished games are
+# reset automatically.
+class BatchEnv:
+    # The actions that can be given for each game in step
+    NOOP, LEFT, RIGHT, ROTATE, DOWN, HARD_DROP = range(6)
+    n_actions = 6
+
+    # Constructor for creating n_games games with the given grid dimensions
+    def __init__(self, n_games, grid_h=20, grid_w=12, seed=None):
+        self.n_games = n_games
+        self.grid_height = grid_h
+        self.grid_width = grid_w
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.zeros((n_games, grid_h, grid_w), dtype=np.uint8)
+        self.scores = np.zeros(n_games, dtype=np.int64)
+        # the state of the active tetromino of each game
+        self.types = np.zeros(n_games, dtype=np.int64)  # index in TYPES
+        self.rotations = np.zeros(n_games, dtype=np.int64)
+        self.xs = np.zeros(n_games, dtype=np.int64)  # bottom left cell
+        self.ys = np.zeros(n_games, dtype=np.int64)
+        self.values = np.zeros((n_games, 4), dtype=np.uint8)  # tile values
+        self.next_types = np.zeros(n_games, dtype=np.int64)
+        self.reset()
+
+    # Method used for starting new games for all the boards (or only for the
+    # boards selected by the given boolean mask). Returns the observation.
+    def reset(self, mask=None):
+        if mask is None:
+            mask = np.ones(self.n_games, dtype=bool)
+        self.boards[mask] = EMPTY
+        self.scores[mask] = 0
+        self.next_types[mask] = self.rng.integers(0, len(TYPES), np.count_nonzero(mask))
+        self._spawn(mask)
+        return self.observation()
+
+    # Method that returns the observation of all the games: a copy of the game
+    # grids (the active tetrominoes are given by the types, rotations, xs, ys
+    # and values arrays)
+    def observation(self):
+        return self.boards.copy()
+
+    # Method used for applying the given actions (an array of N action values)
+    # to all the games. Returns (observation, rewards, dones, info) where the
+    # rewards are the points scored in this step, dones marks the games that
+    # are over (and have been reset) and info holds their final scores.
+    def step(self, actions):
+        actions = np.asarray(actions)
+        scores_before = self.scores.copy()
+        self._shift(actions == BatchEnv.LEFT, -1, 0)
+        self._shift(actions == BatchEnv.RIGHT, 1, 0)
+        self._shift(actions == BatchEnv.DOWN, 0, -1)
+        self._rotate(actions == BatchEnv.ROTATE)
+        self._hard_drop(actions == BatchEnv.HARD_DROP)
+        # move all the tetrominoes down by one (auto fall) and lock the ones that
+        # cannot go down anymore
+        landed = ~self._shift(np.ones(self.n_games, dtype=bool), 0, -1)
+        dones = self._lock(landed)
+        self._settle(landed & ~dones)
+        rewards = self.scores - scores_before
+        final_scores = self.scores[dones].copy()
+        self._spawn(landed & ~dones)
+        if dones.any():
+            self.reset(dones)
+        return self.observation(), rewards, dones, {'final_scores': final_scores}
+
+    # Method that returns the (N, 4) column and row indexes of the tiles of the
+    # tetrominoes of the selected games for the given rotations and positions
+    def _cells(self, index, rotations, xs, ys):
+        offsets = OFFSETS[self.types[index], rotations]
+        return xs[:, None] + offsets[..., 0], ys[:, None] + offsets[..., 1]
+
+    # Method used for checking whether the tetrominoes of the selected games fit
+    # on their game grids with the given rotations and positions (the same test
+    # as Piece.fits: inside the walls, above the bottom and not overlapping the
+    # locked tiles, the tiles above the game grid are allowed)
+    def _fits(self, index, rotations, xs, ys):
+        cols, rows = self._cells(index, rotations, xs, ys)
+        inside = ((cols >= 0) & (cols < self.grid_width) & (rows >= 0)).all(axis=1)
+        occupied = self.boards[index[:, None],
+                               np.clip(rows, 0, self.grid_height - 1),
+                               np.clip(cols, 0, self.grid_width - 1)] != EMPTY
+        occupied &= rows < self.grid_height
+        return inside & ~occupied.any(axis=1)
+
+    # Method used for moving the tetrominoes of the games in the given mask by
+    # (dx, dy) when they fit. Returns the mask of the games that are moved.
+    def _shift(self, mask, dx, dy):
+        moved = np.zeros(self.n_games, dtype=bool)
+        index = np.flatnonzero(mask)
+        if len(index) == 0:
+            return moved
+        fits = self._fits(index, self.rotations[index], self.xs[index] + dx,
+                          self.ys[index] + dy)
+        index = index[fits]
+        self.xs[index] += dx
+        self.ys[index] += dy
+        moved[index] = True
+        return moved
+
+    # Method used for rotating the tetrominoes of the games in the given mask 90
+    # degrees clockwise, trying the wall kicks in order like Piece.rotate
+    def _rotate(self, mask):
+        pending = mask.copy()
+        for k, kick in enumerate(KICKS):
+            index = np.flatnonzero(pending & KICK_ALLOWED[self.types, k])
+            if len(index) == 0:
+                continue
+            rotations = (self.rotations[index] + 1) % 4
+            fits = self._fits(index, rotations, self.xs[index] + kick, self.ys[index])
+            index = index[fits]
+            self.rotations[index] = rotations[fits]
+            self.xs[index] += kick
+            pending[index] = False
+
+    # Method used for dropping the tetrominoes of the games in the given mask
+    # straight down until they land (all of them are moved down together)
+    def _hard_drop(self, mask):
+        falling = mask.copy()
+        while falling.any():
+            falling &= self._shift(falling, 0, -1)
+
+    # Method used for locking the tetrominoes of the games in the given mask on
+    # their game grids. Returns the mask of the games that are over because a
+    # locked tile is above the game grid.
+    def _lock(self, mask):
+        dones = np.zeros(self.n_games, dtype=bool)
+        index = np.flatnonzero(mask)
+        if len(index) == 0:
+            return dones
+        cols, rows = self._cells(index, self.rotations[index], self.xs[index],
+                                 self.ys[index])
+        inside = rows < self.grid_height
+        games = np.broadcast_to(index[:, None], rows.shape)
+        self.boards[games[inside], rows[inside], cols[inside]] = self.values[index][inside]
+        dones[index] = ~inside.all(axis=1)
+        return dones
+
+    # Method used for resolving the merges, row clears and drops of the games in
+    # the given mask to a fixpoint (see Grid.settle)
+    def _settle(self, mask):
+        index = np.flatnonzero(mask)
+        while len(index) != 0:
+            boards = self.boards[index]
+            lead, merged = merge_columns(boards)
+            changed = np.zeros(len(index), dtype=bool)
+            changed[lead[0]] = True
+            np.add.at(self.scores, index[lead[0]], np.left_shift(1, merged.astype(np.int64)))
+            rows_cleared, points = clear_filled_rows(boards)
+            changed |= rows_cleared != 0
+            self.scores[index] += points
+            occupied = boards != EMPTY
+            floating = occupied & ~find_supported(occupied)
+            while floating.any():
+                changed |= floating.any(axis=(1, 2))
+                drop_floating(boards, floating)
+                occupied = boards != EMPTY
+                floating = occupied & ~find_supported(occupied)
+            self.boards[index] = boards
+            # continue only with the games changed in this pass
+            index = index[changed]
+
+    # Method used for creating new tetrominoes for the games in the given mask
+    # (the next tetromino becomes the active one above the game grid at a random
+    # horizontal position like Piece.__init__)
+    def _spawn(self, mask):
+        count = np.count_nonzero(mask)
+        if count == 0:
+            return
+        types = self.next_types[mask]
+        self.types[mask] = types
+        self.rotations[mask] = 0
+        self.xs[mask] = self.rng.integers(0, self.grid_width - SIZES[types] + 1)
+        self.ys[mask] = self.grid_height - 1
+        self.values[mask] = self.rng.integers(1, 3, (count, 4))
+        self.next_types[mask] = self.rng.integers(0, len(TYPES), count)
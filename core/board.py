@@ -0,0 +1,57 @@
+import numpy as np  # the fundamental Python module for scientific computing
+
+from core.cell import EMPTY  # the value used for the empty cells
+
+# Vectorized merge and row clearing operations on tile matrices of tile values
+# (see core/cell.py). The tile matrices can have any number of leading
+# dimensions (..., n_rows, n_cols) so that the same code works for a single game
+# grid and for a batch of game grids; row 0 is the bottom row.
+
+
+# Function used for merging each tile with the tile below it when they have the
+# same number (in place): the lower tile gets the doubled number and the tile
+# above the merged pair moves down by one. The merges are found for all the
+# columns at once. Returns the index arrays of the leading dimensions of the
+# merged tiles (an empty tuple for a single tile matrix) and their new values.
+def merge_columns(tile_matrix):
+    n_rows = tile_matrix.shape[-2]
+    # candidate pairs: the tile in row r has the same value as the tile in row
+    # r - 1 for the rows r = 1, ..., n_rows - 2 (index r - 1 below)
+    upper = tile_matrix[..., 1:n_rows - 1, :]
+    lower = tile_matrix[..., :n_rows - 2, :]
+    candidates = (upper == lower) & (upper != EMPTY)
+    # merging the pair in row r empties row r + 1, so neither the pair in row
+    # r + 1 nor the pair in row r + 2 can be merged in the same pass
+    selected = np.zeros_like(candidates)
+    for i in range(candidates.shape[-2]):
+        selected[..., i, :] = candidates[..., i, :]
+        if i >= 1:
+            selected[..., i, :] &= ~selected[..., i - 1, :]
+        if i >= 2:
+            selected[..., i, :] &= ~selected[..., i - 2, :]
+    indexes = np.nonzero(selected)
+    lead, rows, cols = indexes[:-2], indexes[-2] + 1, indexes[-1]
+    # doubling the number on a tile adds 1 to its value
+    merged = tile_matrix[lead + (rows - 1, cols)] + 1
+    above = tile_matrix[lead + (rows + 1, cols)]
+    tile_matrix[lead + (rows - 1, cols)] = merged
+    tile_matrix[lead + (rows, cols)] = above
+    tile_matrix[lead + (rows + 1, cols)] = EMPTY
+    return lead, merged
+
+
+# Function used for clearing the filled rows of the tile matrix (in place). The
+# filled rows are found with a single reduction and the remaining rows are moved
+# down (stable sort of the rows with the filled ones last) so that no rows are
+# left floating above the cleared ones. Returns the number of rows cleared and
+# the points scored (the sum of the numbers on the cleared tiles) for each
+# tile matrix.
+def clear_filled_rows(tile_matrix):
+    filled = (tile_matrix != EMPTY).all(axis=-1)
+    rows_cleared = np.count_nonzero(filled, axis=-1)
+    numbers = np.left_shift(1, tile_matrix.astype(np.int64))
+    points = (numbers * filled[..., None]).sum(axis=(-2, -1))
+    order = np.argsort(filled, axis=-1, kind='stable')
+    tile_matrix[...] = np.take_along_axis(tile_matrix, order[..., None], axis=-2)
+    tile_matrix[np.take_along_axis(filled, order, axis=-1)] = EMPTY
+    return rows_cleared, points
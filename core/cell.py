@@ -0,0 +1,16 @@
+import random  # used for creating tiles with random numbers
+
+# The tiles of the game are stored as the base 2 logarithm of the number on them
+# (1 for 2, 2 for 4, 3 for 8 and so on) so that the game grid and the tetrominoes
+# can use compact uint8 matrices where 0 is used for the empty cells
+EMPTY = 0
+
+
+# Function that returns the value of a new tile with 2 or 4 as the number on it
+def new_tile_value():
+    return random.randint(1, 2)
+
+
+# Function that returns the number on the tile with the given value
+def tile_number(value):
+    return 1 << int(value)
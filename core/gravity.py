@@ -0,0 +1,41 @@
+import numpy as np  # the fundamental Python module for scientific computing
+
+from core.cell import EMPTY  # the value used for the empty cells
+
+# Vectorized helpers of the gravity pass that drops the groups of tiles which
+# are not supported by the bottom of the game grid. The tile matrices can have
+# any number of leading dimensions (..., n_rows, n_cols) so that the same code
+# works for a single game grid and for a batch of game grids; row 0 is the
+# bottom row.
+
+
+# Function that returns the boolean mask of the supported tiles: the occupied
+# cells that are connected to the bottom row through their left, right, upper
+# and lower neighbours (flood fill from the bottom row). A mask of tiles already
+# known to be supported can be given as an additional starting point of the
+# flood fill.
+def find_supported(occupied, supported=None):
+    if supported is None:
+        supported = np.zeros_like(occupied)
+    else:
+        supported = supported & occupied
+    supported[..., 0, :] |= occupied[..., 0, :]
+    while True:
+        grown = supported.copy()
+        grown[..., 1:, :] |= supported[..., :-1, :]  # tiles above supported ones
+        grown[..., :-1, :] |= supported[..., 1:, :]  # tiles below supported ones
+        grown[..., :, 1:] |= supported[..., :, :-1]  # tiles on the right
+        grown[..., :, :-1] |= supported[..., :, 1:]  # tiles on the left
+        grown &= occupied
+        if np.array_equal(grown, supported):
+            return supported
+        supported = grown
+
+
+# Function that moves the tiles in the given floating mask of the tile matrix
+# down by one row (in place). The cells below the floating tiles are either
+# empty or floating themselves, so all the floating groups can be moved at once.
+def drop_floating(tile_matrix, floating):
+    values = np.where(floating, tile_matrix, EMPTY)
+    tile_matrix[floating] = EMPTY
+    tile_matrix[..., :-1, :] |= values[..., 1:, :]
@@ -0,0 +1,212 @@
+from collections import namedtuple  # used for the results of the grid updates
+from core.cell import EMPTY  # the value used for the empty cells
+from core.board import merge_columns, clear_filled_rows  # vectorized updates
+from core.gravity import find_supported, drop_floating  # the gravity pass
+from point import Point  # used for tile positions
+import numpy as np  # fundamental Python module for scientific computing
+
+
+# The result of clearing the filled rows of the game grid
+ClearResult = namedtuple('ClearResult', ['rows_cleared', 'points'])
+# The result of dropping the floating tiles of the game grid
+GravityResult = namedtuple('GravityResult', ['iterations', 'tiles_dropped'])
+# The report of the cascade of merges, row clears and drops run by settle
+CascadeReport = namedtuple('CascadeReport', ['passes', 'merges', 'rows_cleared',
+                                             'points', 'gravity_iterations',
+                                             'tiles_dropped'])
+
+
+# Class used for modelling the rules of the game grid (locking, merging, row
+# clearing and dropping tiles) without any drawing; GameGrid in game_grid.py
+# adds the rendering on top of it
+class Grid:
+    # Constructor for creating the game grid based on the given arguments
+    def __init__(self, grid_h, grid_w):
+        # set the dimensions of the game grid as the given arguments
+        self.grid_height = grid_h
+        self.grid_width = grid_w
+        # the bitmask of a row whose cells are all occupied
+        self.full_row_mask = (1 << grid_w) - 1
+        Grid.reset(self)
+
+    # Method used for starting a new game on the game grid: the tiles, the
+    # score, the tetrominoes and the game_over flag are reset
+    def reset(self):
+        self.filled_rows = []
+        self.score = 0
+        # create a tile matrix to store the values of the tiles landed onto the
+        # game grid (see core/cell.py for the values stored for the tiles)
+        self.tile_matrix = np.zeros((self.grid_height, self.grid_width), dtype=np.uint8)
+        # the occupancy of each row of the tile matrix as an integer bitmask
+        # (bit col is set when the cell in that column is occupied) which is
+        # kept up to date by set_tile for fast row and collision checks
+        self.row_masks = [0] * self.grid_height
+        # the height of each column (the row index of its topmost tile + 1, or 0
+        # for an empty column) which is also kept up to date on each change to
+        # find the landing positions of the tetrominoes without simulating drops
+        self.column_heights = [0] * self.grid_width
+        # create the tetromino that is currently being moved on the game grid
+        self.current_tetromino = None
+        self.next_tetromino = None
+        # the game_over flag shows whether the game is over or not
+        self.game_over = False
+
+    # Method used for checking whether the grid cell with given row and column
+    # indexes is occupied by a tile or empty
+    def is_occupied(self, row, col):
+        # considering newly entered tetrominoes to the game grid that may have
+        # tiles with position.y >= grid_height
+        if not self.is_inside(row, col):
+            return False
+        # the cell is occupied by a tile if its bit is set in the row bitmask
+        return (self.row_masks[row] >> col) & 1 == 1
+
+    # Method used for placing the tile with the given value (or EMPTY for emptying
+    # the cell) at the given row and column indexes while keeping the row
+    # bitmasks and the column heights up to date
+    def set_tile(self, row, col, value):
+        self.tile_matrix[row][col] = value
+        if value == EMPTY:
+            self.row_masks[row] &= ~(1 << col)
+            # lower the column height to the next tile below when the topmost
+            # tile of the column is removed
+            if self.column_heights[col] == row + 1:
+                height = row
+                while height > 0 and not (self.row_masks[height - 1] >> col) & 1:
+                    height -= 1
+                self.column_heights[col] = height
+        else:
+            self.row_masks[row] |= 1 << col
+            self.column_heights[col] = max(self.column_heights[col], row + 1)
+
+    # Method used for checking whether the cell with given row and column indexes
+    # is inside the game grid or not
+    def is_inside(self, row, col):
+        if row < 0 or row >= self.grid_height:
+            return False
+        if col < 0 or col >= self.grid_width:
+            return False
+        return True
+
+    # Method used for clearing the filled rows of the game grid. The filled rows
+    # are found with a single reduction over the tile matrix, the numbers on
+    # their tiles are added to the score, and the remaining rows are moved down
+    # so that no rows are left floating above the cleared ones (see
+    # core/board.py). Returns a ClearResult (the number of rows cleared and the
+    # points scored).
+    def clearRows(self):
+        # the filled rows are the rows whose bitmasks have all the bits set
+        if self.full_row_mask not in self.row_masks:
+            return ClearResult(0, 0)
+        rows_cleared, points = clear_filled_rows(self.tile_matrix)
+        # the numbers on the tiles of the filled rows are added to the score
+        self.score = self.score + int(points)
+        self.update_occupancy()
+        return ClearResult(int(rows_cleared), int(points))
+
+    # Method used for recomputing the row bitmasks and the column heights from the
+    # tile matrix after the tile matrix is modified by vectorized operations
+    def update_occupancy(self):
+        occupied = self.tile_matrix != EMPTY
+        # the bits of each row are packed into bytes (the bit of column col is
+        # bit col % 8 of byte col // 8) and turned into Python integers, so the
+        # bitmasks do not overflow for game grids with 64 or more columns
+        packed = np.packbits(occupied, axis=1, bitorder='little')
+        self.row_masks = [int.from_bytes(row.tobytes(), 'little') for row in packed]
+        # the topmost tile of each column is the first one found from the top
+        top_index = self.grid_height - np.argmax(occupied[::-1], axis=0)
+        self.column_heights = np.where(occupied.any(axis=0), top_index, 0).tolist()
+
+    def checkRows(self):
+        # a row is filled when all the bits in its bitmask are set
+        filled_rows = []
+        for row in range(self.grid_height):
+            if self.row_masks[row] == self.full_row_mask:
+                filled_rows.append(row)
+        return filled_rows
+
+    # Method used for dropping the groups of tiles (connected through their left,
+    # right, upper and lower neighbours) that are not supported by the bottom
+    # row of the game grid, e.g. the tiles left floating by merges. All the
+    # floating groups are moved down together one row per iteration until every
+    # tile is supported. Returns a GravityResult (the number of iterations and
+    # the number of tiles dropped).
+    def apply_gravity(self):
+        occupied = self.tile_matrix != EMPTY
+        supported = find_supported(occupied)
+        floating = occupied & ~supported
+        # every tile that is dropped is floating before the first iteration
+        tiles_dropped = int(np.count_nonzero(floating))
+        iterations = 0
+        while floating.any():
+            drop_floating(self.tile_matrix, floating)
+            iterations += 1
+            # the supported tiles do not move, so the flood fill only has to be
+            # extended from them to the tiles that have landed
+            occupied = self.tile_matrix != EMPTY
+            supported = find_supported(occupied, supported)
+            floating = occupied & ~supported
+        if iterations != 0:
+            self.update_occupancy()
+        return GravityResult(iterations, tiles_dropped)
+
+    # Method used for merging each tile with the tile below it when they have the
+    # same number (the merged tile gets the doubled number and the tile above the
+    # merged pair moves down by one). The merges are found for all the columns at
+    # once and the number of merged pairs is returned.
+    def merge(self):
+        lead, merged = merge_columns(self.tile_matrix)
+        if len(merged) == 0:
+            return 0
+        self.score = self.score + int(np.left_shift(1, merged.astype(np.int64)).sum())
+        self.update_occupancy()
+        return len(merged)
+
+    # Method used for resolving all the chain reactions after a tetromino is
+    # locked: merges, row clears and drops are repeated until a pass changes
+    # nothing (fixpoint), so a whole cascade is resolved in one call. Returns a
+    # CascadeReport with the totals of the cascade (points includes the points
+    # of both the merges and the cleared rows).
+    def settle(self):
+        score_before = self.score
+        passes, merges, rows_cleared = 0, 0, 0
+        gravity_iterations, tiles_dropped = 0, 0
+        while True:
+            passes += 1
+            merged = self.merge()
+            cleared = self.clearRows()
+            dropped = self.apply_gravity()
+            merges += merged
+            rows_cleared += cleared.rows_cleared
+            gravity_iterations += dropped.iterations
+            tiles_dropped += dropped.tiles_dropped
+            # stop when nothing is merged, cleared or dropped in this pass
+            if merged == 0 and cleared.rows_cleared == 0 and dropped.iterations == 0:
+                break
+        return CascadeReport(passes, merges, rows_cleared, self.score - score_before,
+                             gravity_iterations, tiles_dropped)
+
+    # Method that locks the tiles of the landed tetromino on the game grid while
+    # checking if the game is over due to having tiles above the topmost grid row.
+    # The method returns True when the game is over and False otherwise.
+    def update_grid(self, tiles_to_lock, blc_position):
+        # necessary for the display method to stop displaying the tetromino
+        self.current_tetromino = None
+        # lock the tiles of the current tetromino (tiles_to_lock) on the game grid
+        n_rows, n_cols = len(tiles_to_lock), len(tiles_to_lock[0])
+        for col in range(n_cols):
+            for row in range(n_rows):
+                # place each tile onto the game grid
+                if tiles_to_lock[row][col] != EMPTY:
+                    # compute the position of the tile on the game grid
+                    pos = Point()
+                    pos.x = blc_position.x + col
+                    pos.y = blc_position.y + (n_rows - 1) - row
+                    if self.is_inside(pos.y, pos.x):
+                        self.set_tile(pos.y, pos.x, tiles_to_lock[row][col])
+                    # the game is over if any placed tile is above the game grid
+                    else:
+                        self.game_over = True
+        # return the game_over flag
+        return self.game_over
+
@@ -0,0 +1,181 @@
+from core.cell import new_tile_value  # the values of the tiles on the piece
+from core.shapes import SHAPES, ROTATIONS, WALL_KICKS  # the tetromino shapes
+from point import Point  # used for tile positions
+import copy as cp  # the copy module is used for copying tiles and positions
+import random  # module for generating random values/permutations
+import numpy as np  # the fundamental Python module for scientific computing
+
+
+# Class used for modeling the movement of tetrominoes with 7 different
+# types/shapes (I, O, Z, L, J, S and T) without any drawing; Tetromino in
+# tetromino.py adds the drawing on top of it
+class Piece:
+    # The dimensions of the game grid
+    grid_height, grid_width = None, None
+
+    # Constructor for creating a tetromino with a given type (shape)
+    def __init__(self, type):
+        # set the shape of the tetromino based on the given type by using the
+        # precomputed rotation table (see core/shapes.py)
+        self.type = type
+        self.rotations = ROTATIONS[type]
+        self.rotation = 0  # index of the current rotation in the table
+        # n = number of rows = number of columns in the tile matrix
+        n = self.n = SHAPES[type][0]
+        # create the values of the four tiles (minos) of the tetromino in the
+        # order of the tiles in the rotation table
+        self.values = np.array([new_tile_value() for i in range(4)], dtype=np.uint8)
+        # initialize the position of the tetromino (the bottom left cell in the
+        # tile matrix) with a random horizontal position above the game grid
+        self.bottom_left_cell = Point()
+        self.bottom_left_cell.y = self.grid_height - 1
+        self.bottom_left_cell.x = random.randint(0, self.grid_width - n)
+
+    # The n x n matrix of the tile values of the tetromino in its current rotation
+    # (built on demand from the rotation table)
+    @property
+    def tile_matrix(self):
+        tile_matrix = np.zeros((self.n, self.n), dtype=np.uint8)
+        for (row, col), value in zip(self.rotations[self.rotation].cells, self.values):
+            tile_matrix[row][col] = value
+        return tile_matrix
+
+    # Method that returns the positions of the tiles of the tetromino on the game
+    # grid together with their values as a list of (position, value) pairs
+    def get_tiles(self):
+        blc = self.bottom_left_cell
+        return [(Point(blc.x + dx, blc.y + dy), value) for (dx, dy), value
+                in zip(self.rotations[self.rotation].offsets, self.values)]
+
+    # Method that returns a copy of tile_matrix omitting empty rows and columns
+    # and the position of the bottom left cell when return_position is set
+    def get_min_bounded_tile_matrix(self, return_position=False):
+        rotation = self.rotations[self.rotation]
+        # the bounding box of the tiles is stored in the rotation table
+        min_dx, max_dx, min_dy, max_dy = rotation.bounds
+        copy = np.zeros((max_dy - min_dy + 1, max_dx - min_dx + 1), dtype=np.uint8)
+        for (dx, dy), value in zip(rotation.offsets, self.values):
+            copy[max_dy - dy][dx - min_dx] = value
+        # return just the resulting copy matrix when return_position is not set
+        if not return_position:
+            return copy
+        # otherwise return the position of the bottom left cell in copy as well
+        else:
+            blc_position = cp.copy(self.bottom_left_cell)
+            blc_position.translate(min_dx, min_dy)
+            return copy, blc_position
+
+    def move(self, direction, game_grid):
+        # rotation is handled by the rotate method defined below as it may also
+        # shift the tetromino horizontally (wall kick)
+        if direction == "space":
+            return self.rotate(game_grid)
+        # check if the tetromino can be moved in the given direction by using the
+        # can_be_moved method defined below
+        if not (self.can_be_moved(direction, game_grid)):
+            return False  # the tetromino cannot be moved in the given direction
+        # move the tetromino by updating the position of the bottom left cell in
+        # the tile matrix
+        if direction == "left":
+            self.bottom_left_cell.x -= 1
+        elif direction == "right":
+            self.bottom_left_cell.x += 1
+        elif direction == "down":
+            self.bottom_left_cell.y -= 1
+        return True  # successful move in the given direction
+
+    # Method for rotating the tetromino 90 degrees clockwise by moving to the next
+    # rotation in the rotation table. When the rotated tetromino does not fit at
+    # its position, it is shifted horizontally by the wall kicks of its type.
+    def rotate(self, game_grid):
+        kick = self.find_rotation_kick(game_grid)
+        if kick is None:
+            return False  # the tetromino cannot be rotated
+        self.rotation = (self.rotation + 1) % 4
+        self.bottom_left_cell.x += kick
+        return True  # successful rotation
+
+    # Method that returns the first wall kick for which the tetromino fits on the
+    # game grid after rotating it (or None when it fits for none of them)
+    def find_rotation_kick(self, game_grid):
+        rotation = (self.rotation + 1) % 4
+        x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+        for kick in WALL_KICKS[self.type]:
+            if self.fits(game_grid, rotation, x + kick, y):
+                return kick
+        return None
+
+    # Method for dropping the tetromino straight down until it lands on the game
+    # grid (hard drop). Returns the number of rows the tetromino is dropped.
+    def hard_drop(self, game_grid):
+        landing = self.landing_position(game_grid)
+        rows_dropped = self.bottom_left_cell.y - landing.y
+        self.bottom_left_cell.y = landing.y
+        return rows_dropped
+
+    # Method that returns the position of the bottom left cell where the
+    # tetromino lands when it is dropped straight down from its position. The
+    # landing row is computed from the column heights of the game grid: each
+    # column of the tetromino rests on the topmost tile of the grid column below
+    # it, so the query takes one step per column of the tetromino.
+    def landing_position(self, game_grid):
+        rotation = self.rotations[self.rotation]
+        x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+        heights = game_grid.column_heights
+        landing_y = max(heights[x + dx] - dy for dx, dy in rotation.column_bottoms)
+        # when the tetromino is below the topmost tile of a column (under an
+        # overhang), the column heights cannot be used and it is moved down
+        # until it does not fit anymore
+        if landing_y > y:
+            landing_y = y
+            while self.fits(game_grid, self.rotation, x, landing_y - 1):
+                landing_y -= 1
+        return Point(x, landing_y)
+
+    # Method that returns all the placements of the tetromino on the game grid
+    # when it is dropped from above the game grid as (rotation, x, y) tuples,
+    # where (x, y) is the position of the bottom left cell after landing (used
+    # for enumerating the moves of a bot with one step per column)
+    def get_placements(self, game_grid):
+        heights = game_grid.column_heights
+        placements = []
+        for rotation_index, rotation in enumerate(self.rotations):
+            min_dx, max_dx = rotation.bounds[0], rotation.bounds[1]
+            for x in range(-min_dx, self.grid_width - max_dx):
+                y = max(heights[x + dx] - dy for dx, dy in rotation.column_bottoms)
+                placements.append((rotation_index, x, y))
+        return placements
+
+    # Method to check if the tetromino can be moved in the given direction or not
+    def can_be_moved(self, dir, game_grid):
+        x, y = self.bottom_left_cell.x, self.bottom_left_cell.y
+        if dir == "left":
+            return self.fits(game_grid, self.rotation, x - 1, y)
+        elif dir == "right":
+            return self.fits(game_grid, self.rotation, x + 1, y)
+        elif dir == "down":
+            return self.fits(game_grid, self.rotation, x, y - 1)
+        # direction = space --> rotation (with the wall kicks)
+        return self.find_rotation_kick(game_grid) is not None
+
+    # Method used for checking whether the tetromino with the given rotation fits
+    # on the game grid when its bottom left cell is at (x, y): all the tiles must
+    # be inside the walls and above the bottom of the game grid, and the tiles
+    # inside the game grid must not overlap the locked tiles (the tiles above the
+    # game grid are possible for newly entered tetrominoes). Uses the bounding
+    # box and the row bitmasks precomputed in the rotation table, so it takes at
+    # most four bitwise tests against the row bitmasks of the game grid.
+    def fits(self, game_grid, rotation, x, y):
+        rotation = self.rotations[rotation]
+        min_dx, max_dx, min_dy, max_dy = rotation.bounds
+        if x + min_dx < 0 or x + max_dx >= self.grid_width or y + min_dy < 0:
+            return False
+        for dy, bits in rotation.row_bits:
+            row = y + dy
+            if row < game_grid.grid_height:
+                # shift the bits of the row to the columns of the tiles (x may be
+                # negative when the leftmost tiles are not in the first column)
+                mask = bits << x if x >= 0 else bits >> -x
+                if game_grid.row_masks[row] & mask:
+                    return False
+        return True
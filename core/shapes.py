@@ -0,0 +1,67 @@
+from collections import namedtuple  # used for the entries of the rotation table
+
+# The shapes of the 7 tetromino types in their initial orientation as the size n
+# of their n x n tile matrix and the (column_index, row_index) positions of their
+# four tiles (minos) in this matrix
+SHAPES = {
+    'I': (4, ((1, 0), (1, 1), (1, 2), (1, 3))),
+    'L': (3, ((1, 0), (1, 1), (1, 2), (2, 2))),
+    'J': (3, ((1, 0), (1, 1), (1, 2), (0, 2))),
+    'S': (3, ((1, 0), (2, 0), (0, 1), (1, 1))),
+    'T': (3, ((0, 1), (1, 0), (1, 1), (2, 1))),
+    'O': (2, ((0, 0), (1, 0), (0, 1), (1, 1))),
+    'Z': (3, ((0, 1), (1, 1), (1, 2), (2, 2))),
+}
+
+# One rotation (orientation) of a tetromino type:
+# cells: the (row_index, column_index) positions of the four tiles in the tile
+#     matrix, in the same order as in SHAPES (so the i-th tile keeps its number
+#     while the tetromino is rotated)
+# offsets: the (dx, dy) positions of the four tiles relative to the bottom left
+#     cell of the tile matrix (dx to the right, dy upwards on the game grid)
+# bounds: (min_dx, max_dx, min_dy, max_dy) bounding box of the offsets
+# row_bits: (dy, bits) pairs giving for each row of the tetromino the bitmask of
+#     its tiles (bit dx is set for each tile) to be shifted by the column of the
+#     bottom left cell and tested against the row bitmasks of the game grid
+# column_bottoms: (dx, dy) pairs giving the lowest tile of each column of the
+#     tetromino (used for finding where it lands from the column heights)
+Rotation = namedtuple('Rotation', ['cells', 'offsets', 'bounds', 'row_bits',
+                                   'column_bottoms'])
+
+
+# Function that builds the table entry of the rotation with the given tiles
+def _make_rotation(n, cells):
+    offsets = tuple((col, (n - 1) - row) for row, col in cells)
+    dxs = [dx for dx, dy in offsets]
+    dys = [dy for dx, dy in offsets]
+    row_bits, column_bottoms = {}, {}
+    for dx, dy in offsets:
+        row_bits[dy] = row_bits.get(dy, 0) | (1 << dx)
+        column_bottoms[dx] = min(column_bottoms.get(dx, dy), dy)
+    return Rotation(cells, offsets, (min(dxs), max(dxs), min(dys), max(dys)),
+                    tuple(sorted(row_bits.items())),
+                    tuple(sorted(column_bottoms.items())))
+
+
+# Function that computes the four rotations of the tetromino with the given type
+# (rotating the tile matrix 90 degrees clockwise moves the tile in row r and
+# column c to row c and column n - 1 - r)
+def _compute_rotations(type):
+    n, occupied_tiles = SHAPES[type]
+    cells = tuple((row, col) for col, row in occupied_tiles)
+    rotations = []
+    for i in range(4):
+        rotations.append(_make_rotation(n, cells))
+        cells = tuple((col, (n - 1) - row) for row, col in cells)
+    return tuple(rotations)
+
+
+# The table of the four rotations for each tetromino type (ROTATIONS[type][r] is
+# the orientation after r clockwise rotations) computed once when the module is
+# imported
+ROTATIONS = {type: _compute_rotations(type) for type in SHAPES}
+
+# The horizontal shifts (wall kicks) tried in order when rotating a tetromino
+# next to a wall or other tiles (the long I tetromino may need to move by two)
+WALL_KICKS = {type: (0, -1, 1) for type in SHAPES}
+WALL_KICKS['I'] = (0, -1, 1, -2, 2)
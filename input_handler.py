@@ -0,0 +1,62 @@
+import time  # used for timing the repeats of the held keys
+import lib.stddraw as stddraw  # used for reading the key events
+
+# The default delay (in ms) before a held key starts repeating (delayed auto
+# shift, DAS) and the default interval (in ms) between its repeats (auto repeat
+# rate, ARR)
+DEFAULT_DAS = 170
+DEFAULT_ARR = 50
+# The keys that repeat while they are held down
+REPEAT_KEYS = ("left", "right", "down")
+
+
+# Class used for reading the keyboard in the game loop: every key pressed since
+# the last poll is returned in order (no key is dropped), and the held movement
+# keys are repeated after a delay (DAS) at a fixed rate (ARR), so the controls
+# respond the same way at every level
+class InputHandler:
+    # Constructor for creating an input handler with the given delay and
+    # interval (in ms) of the repeats of the held keys (arr must be positive)
+    def __init__(self, das=DEFAULT_DAS, arr=DEFAULT_ARR, repeat_keys=REPEAT_KEYS):
+        self.das = das / 1000
+        self.arr = arr / 1000
+        self.repeat_keys = repeat_keys
+        # the time of the next repeat of each held key
+        self.held = {}
+
+    # Method used for forgetting the queued key events and the held keys (e.g.
+    # after a menu has been displayed)
+    def clear(self):
+        stddraw.clearKeyEvents()
+        self.held.clear()
+
+    # Method that reads the keyboard and returns the keys to handle as a list
+    # of (time, key) pairs in the order of their times: the keys pressed since
+    # the last poll and the repeats of the held keys that are due
+    def poll(self):
+        stddraw.pollEvents()
+        keys = []
+        while stddraw.hasNextKeyEvent():
+            event_time, pressed, key = stddraw.nextKeyEvent()
+            if pressed:
+                keys.append((event_time, key))
+                if key in self.repeat_keys:
+                    self.held[key] = event_time + self.das
+            elif key in self.held:
+                # the repeats before the key was released are still handled
+                self.add_repeats(keys, key, event_time)
+                del self.held[key]
+        now = time.perf_counter()
+        for key in list(self.held):
+            self.add_repeats(keys, key, now)
+        keys.sort(key=lambda item: item[0])
+        return keys
+
+    # Method used for adding the repeats of the given held key that are due at
+    # the given time to the given list of keys
+    def add_repeats(self, keys, key, until):
+        repeat_time = self.held[key]
+        while repeat_time <= until:
+            keys.append((repeat_time, key))
+            repeat_time += self.arr
+        self.held[key] = repeat_time
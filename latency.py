@@ -0,0 +1,63 @@
+import json  # used for exporting the latency report
+
+
+# Class used for measuring the input-to-display latency: the time from the
+# moment a key is read (see input_handler.py) to the moment the frame showing
+# its effect on the game grid has been presented. The inputs that change the
+# game (e.g. a successful Tetromino.move) are recorded with the time of their
+# key, and each presented frame turns the recorded inputs into latency samples.
+class LatencyTracker:
+    # Constructor for creating a tracker with no samples
+    def __init__(self):
+        # the key times of the inputs applied since the last presented frame
+        self.pending = []
+        # the latencies (in seconds) measured in this session
+        self.samples = []
+        # the summary of the samples (computed again when the samples change)
+        self.cached_summary = None
+
+    # Method used for recording an input (read at the given perf_counter time)
+    # that has changed the game, so it is shown by the next presented frame
+    def input_applied(self, input_time):
+        self.pending.append(input_time)
+
+    # Method used for recording that a frame has been presented at the given
+    # perf_counter time (the latencies of the pending inputs are measured)
+    def frame_presented(self, present_time):
+        if self.pending:
+            self.samples.extend(present_time - t for t in self.pending)
+            self.pending = []
+            self.cached_summary = None
+
+    # Method that returns the summary of the latencies measured in this session
+    # as a dictionary (the number of samples and the mean, p50, p95, p99 and
+    # maximum latencies in ms, which are None when there are no samples)
+    def summary(self):
+        if self.cached_summary is None:
+            summary = {"count": len(self.samples)}
+            if self.samples:
+                # numpy is imported only when the latencies are summarized
+                import numpy as np
+                samples = np.array(self.samples) * 1000
+                p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+                summary.update(mean=float(samples.mean()), p50=float(p50),
+                               p95=float(p95), p99=float(p99),
+                               max=float(samples.max()))
+            else:
+                summary.update(mean=None, p50=None, p95=None, p99=None, max=None)
+            self.cached_summary = summary
+        return self.cached_summary
+
+    # Method that returns the summary as a short text for the overlay
+    def summary_text(self):
+        summary = self.summary()
+        if summary["count"] == 0:
+            return "latency: -"
+        return "p50 %.0f  p95 %.0f  p99 %.0f ms" % (summary["p50"], summary["p95"],
+                                                   summary["p99"])
+
+    # Method used for exporting the summary of the session to the given file
+    # as JSON
+    def save_report(self, path):
+        with open(path, "w") as report_file:
+            json.dump(self.summary(), report_file, indent=2)
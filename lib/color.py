@@ -9,9 +9,14 @@ objects.
 
 class Color:
     """
-    A Color object models an RGB color.
+    A Color object models an RGB color. Color objects are immutable,
+    so the same object can be shared (see intern()).
     """
 
+    # The pygame color converted from self is kept in _pygameColor by
+    # stddraw, so that each color is converted only once.
+    __slots__ = ('_r', '_g', '_b', '_pygameColor')
+
     #-------------------------------------------------------------------
 
     def __init__(self, r=0, g=0, b=0):
@@ -22,6 +27,7 @@ class Color:
         self._r = r  # Red component
         self._g = g  # Green component
         self._b = b  # Blue component
+        self._pygameColor = None  # Converted pygame color
 
     #-------------------------------------------------------------------
 
@@ -60,38 +66,54 @@ class Color:
 
 #-----------------------------------------------------------------------
 
+# The interned Color objects, keyed by their (r, g, b) components.
+_interned = {}
+
+def intern(r, g, b):
+    """
+    Return the shared Color object with the given red (r), green (g),
+    and blue (b) components, creating it on the first call.
+    """
+    c = _interned.get((r, g, b))
+    if c is None:
+        c = Color(r, g, b)
+        _interned[(r, g, b)] = c
+    return c
+
+#-----------------------------------------------------------------------
+
 # Some predefined Color objects:
 
-WHITE      = Color(255, 255, 255)
-BLACK      = Color(  0,   0,   0)
+WHITE      = intern(255, 255, 255)
+BLACK      = intern(  0,   0,   0)
 
-RED        = Color(255,   0,   0)
-GREEN      = Color(  0, 255,   0)
-BLUE       = Color(  0,   0, 255)
+RED        = intern(255,   0,   0)
+GREEN      = intern(  0, 255,   0)
+BLUE       = intern(  0,   0, 255)
 
-CYAN       = Color(  0, 255, 255)
-MAGENTA    = Color(255,   0, 255)
-YELLOW     = Color(255, 255,   0)
+CYAN       = intern(  0, 255, 255)
+MAGENTA    = intern(255,   0, 255)
+YELLOW     = intern(255, 255,   0)
 
-DARK_RED   = Color(128,   0,   0)
-DARK_GREEN = Color(  0, 128,   0)
-DARK_BLUE  = Color(  0,   0, 128)
+DARK_RED   = intern(128,   0,   0)
+DARK_GREEN = intern(  0, 128,   0)
+DARK_BLUE  = intern(  0,   0, 128)
 
-GRAY       = Color(128, 128, 128)
-DARK_GRAY  = Color( 64,  64,  64)
-LIGHT_GRAY = Color(192, 192, 192)
+GRAY       = intern(128, 128, 128)
+DARK_GRAY  = intern( 64,  64,  64)
+LIGHT_GRAY = intern(192, 192, 192)
 
-ORANGE     = Color(255, 200,   0)
-VIOLET     = Color(238, 130, 238)
-PINK       = Color(255, 175, 175)
+ORANGE     = intern(255, 200,   0)
+VIOLET     = intern(238, 130, 238)
+PINK       = intern(255, 175, 175)
 
 # Shade of blue used in Introduction to Programming in Java.
 # It is Pantone 300U. The RGB values are approximately (9, 90, 166).
-BOOK_BLUE  = Color(  9,  90, 166)
-BOOK_LIGHT_BLUE = Color(103, 198, 243)
+BOOK_BLUE  = intern(  9,  90, 166)
+BOOK_LIGHT_BLUE = intern(103, 198, 243)
 
 # Shade of red used in Algorithms 4th edition
-BOOK_RED   = Color(150,  35,  31)
+BOOK_RED   = intern(150,  35,  31)
 
 #-----------------------------------------------------------------------
 
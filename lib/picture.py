@@ -95,3 +95,17 @@ class Picture:
         """
         pygameColor = pygame.Color(c.getRed(), c.getGreen(), c.getBlue(), 0)
         self._surface.set_at((x, y), pygameColor)
+
+    #-------------------------------------------------------------------
+
+    def convert(self):
+        """
+        Convert self to the pixel format of the display (keeping the
+        transparency of the pixels, if any), so that drawing self
+        does not convert its pixels each time. The display must
+        have been created (e.g. by stddraw.setCanvasSize()).
+        """
+        if self._surface.get_flags() & pygame.SRCALPHA:
+            self._surface = self._surface.convert_alpha()
+        else:
+            self._surface = self._surface.convert()
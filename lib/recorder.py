@@ -0,0 +1,263 @@
+"""
+recorder.py
+
+The recorder module defines the FrameRecorder class, which records the
+frames shown by stddraw into a sequence of PNG files or an animated GIF
+file without slowing down the drawing.
+"""
+
+#-----------------------------------------------------------------------
+
+import os
+import time
+import queue
+import multiprocessing
+
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = 'hide'
+import pygame
+
+import lib.stddraw as stddraw
+
+# Pillow is needed only for recording animated GIF files.
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+#-----------------------------------------------------------------------
+
+_DEFAULT_QUEUE_SIZE = 32
+
+# Most GIF viewers show the frames shorter than 20 milliseconds for much
+# longer, so the GIF files are recorded at 50 frames per second at most.
+_DEFAULT_FPS = 50
+
+# The frames of a GIF file are kept in memory until the file is written
+# (about 0.5 MB per frame of the 680x800 game canvas), so GIF files are
+# limited to short clips.
+_DEFAULT_MAX_GIF_FRAMES = 500
+
+#-----------------------------------------------------------------------
+
+class FrameRecorder:
+    """
+    A FrameRecorder object records the frames shown by stddraw. Each
+    frame shown is copied into a bounded queue, and a background
+    process encodes the frames into a sequence of PNG files (when the
+    path is a directory) or an animated GIF file (when the path ends
+    with '.gif', which requires Pillow). The encoding runs in another
+    process because the image encoders hold the interpreter lock.
+    When the encoding falls behind, the frames that do not fit in the
+    queue are dropped, so that recording never stalls the drawing.
+
+    Each frame of a GIF file is shown for as long as it was shown by
+    stddraw (e.g. a menu that waits for an input stays on its frame).
+    The PNG files are written as the frames arrive, but the frames of
+    a GIF file are kept in memory until it is written, so a GIF file
+    holds at most maxGifFrames frames; the frames shown after that
+    are dropped.
+    """
+
+    #-------------------------------------------------------------------
+
+    def __init__(self, path, queueSize=_DEFAULT_QUEUE_SIZE,
+        fps=_DEFAULT_FPS, maxGifFrames=_DEFAULT_MAX_GIF_FRAMES):
+        """
+        Construct self such that it records the frames into path,
+        keeping at most queueSize frames waiting to be encoded. fps
+        is the maximum frame rate of the animated GIF file (the
+        frames shown sooner are skipped), and maxGifFrames is the
+        maximum number of frames of the animated GIF file.
+        """
+        self._path = path
+        self._gif = path.lower().endswith('.gif')
+        if self._gif and (Image is None):
+            raise ImportError('Recording GIF files requires Pillow')
+        context = multiprocessing.get_context('spawn')
+        self._queue = context.Queue(queueSize)
+        self._recorded = context.Value('i', 0)  # Number of frames encoded
+        self._dropped = context.Value('i', 0)   # Number of frames dropped
+        self._process = context.Process(target=_encode,
+            args=(self._queue, self._recorded, self._dropped, path,
+            self._gif, fps, maxGifFrames),
+            daemon=True)
+        self._started = False
+
+    #-------------------------------------------------------------------
+
+    def start(self):
+        """
+        Start recording the frames shown by stddraw.
+        """
+        if self._process.pid is not None:
+            raise Exception('The recorder already was started')
+        if not self._gif:
+            os.makedirs(self._path, exist_ok=True)
+        self._process.start()
+        self._started = True
+        stddraw.addFrameListener(self._capture)
+
+    #-------------------------------------------------------------------
+
+    def stop(self):
+        """
+        Stop recording, and wait until the frames in the queue are
+        encoded (and the GIF file is written).
+        """
+        if not self._started:
+            return
+        self._started = False
+        stddraw.removeFrameListener(self._capture)
+        if self._process.is_alive():
+            # The time of the end of the last frame.
+            self._queue.put((time.perf_counter(), None, None))
+            self._process.join()
+        else:
+            # Nothing reads the frames left in the queue, so do not
+            # wait for them to be sent when the program exits.
+            self._queue.cancel_join_thread()
+
+    #-------------------------------------------------------------------
+
+    def recorded(self):
+        """
+        Return the number of frames encoded by self.
+        """
+        return self._recorded.value
+
+    #-------------------------------------------------------------------
+
+    def dropped(self):
+        """
+        Return the number of frames dropped by self because the queue
+        was full or the animated GIF file had too many frames.
+        """
+        return self._dropped.value
+
+    #-------------------------------------------------------------------
+
+    def _capture(self, surface):
+        """
+        Copy surface (the frame shown) into the queue with the time
+        it is shown, or drop it if the queue is full.
+        """
+        frameTime = time.perf_counter()
+        if self._queue.full():
+            _count(self._dropped)
+            return
+        try:
+            self._queue.put_nowait((frameTime, surface.get_size(),
+                pygame.image.tostring(surface, 'RGB')))
+        except queue.Full:
+            _count(self._dropped)
+
+#-----------------------------------------------------------------------
+
+def _count(counter):
+    """
+    Add one to counter, a multiprocessing.Value shared by the
+    processes.
+    """
+    with counter.get_lock():
+        counter.value += 1
+
+#-----------------------------------------------------------------------
+
+def _encode(frames, recorded, dropped, path, gif, fps, maxFrames):
+    """
+    Encode the frames ((time, size, RGB pixels) tuples) taken from the
+    queue frames into path until a tuple whose pixels are None (the
+    time recording stopped) is taken, counting the frames encoded in
+    recorded and the frames dropped in dropped (run by the background
+    process).
+    """
+    if gif:
+        _encodeGif(frames, recorded, dropped, path, fps, maxFrames)
+        return
+    while True:
+        frameTime, size, pixels = frames.get()
+        if pixels is None:
+            break
+        fileName = os.path.join(path, 'frame%06d.png' % recorded.value)
+        pygame.image.save(pygame.image.fromstring(pixels, size, 'RGB'),
+            fileName)
+        recorded.value += 1
+
+def _encodeGif(frames, recorded, dropped, path, fps, maxFrames):
+    """
+    Encode the frames taken from the queue frames into the animated
+    GIF file path as _encode() does. Each frame lasts until the next
+    one is shown, but at least 1/fps seconds: a frame shown sooner is
+    skipped, unless it is the last one shown before a frame that comes
+    later than 2/fps seconds after the previous frame of the file.
+    The frames after the first maxFrames ones are dropped.
+    """
+    minDuration = 1.0 / fps
+    images = []     # The frames of the GIF file
+    times = []      # The times when the frames of the GIF file are shown
+    endTime = None  # The time when the last frame of the GIF file ends
+    lastPixels = None
+    pending = None  # The last frame skipped, as a (size, pixels) pair
+    while True:
+        frameTime, size, pixels = frames.get()
+        # A frame that is the same as the previous one only makes the
+        # previous one last longer.
+        if (pixels is not None) and (pixels == lastPixels):
+            continue
+        if (pixels is not None) and (len(images) >= maxFrames):
+            if endTime is None:
+                endTime = frameTime
+            _count(dropped)
+            continue
+        lastPixels = pixels
+        if (pending is not None) and (frameTime - times[-1] >= 2 * minDuration):
+            pendingSize, pendingPixels = pending
+            images.append(Image.frombytes('RGB', pendingSize,
+                pendingPixels).quantize())
+            times.append(times[-1] + minDuration)
+            recorded.value += 1
+        pending = None
+        if pixels is None:
+            break
+        if len(images) >= maxFrames:
+            endTime = frameTime
+            _count(dropped)
+        elif images and (frameTime - times[-1] < minDuration):
+            pending = (size, pixels)
+        else:
+            images.append(Image.frombytes('RGB', size, pixels).quantize())
+            times.append(frameTime)
+            recorded.value += 1
+    if images:
+        # The last frame lasts until the first frame dropped or the end
+        # of recording.
+        if endTime is None:
+            endTime = frameTime
+        times.append(max(endTime, times[-1] + minDuration))
+        durations = [int(round(1000 * (end - start)))
+            for start, end in zip(times, times[1:])]
+        images[0].save(path, save_all=True, append_images=images[1:],
+            duration=durations, loop=0)
+
+#-----------------------------------------------------------------------
+
+def _main():
+    """
+    For testing: record a few frames of a moving square into the
+    directory given as the command-line argument.
+    """
+    import sys
+    stddraw.setHeadless()
+    recorder = FrameRecorder(sys.argv[1])
+    recorder.start()
+    for i in range(20):
+        stddraw.clear(stddraw.WHITE)
+        stddraw.setPenColor(stddraw.BLUE)
+        stddraw.filledSquare(i / 20.0, 0.5, 0.1)
+        stddraw.show(0)
+    recorder.stop()
+    print(recorder.recorded(), 'frames recorded,', recorder.dropped(),
+        'dropped')
+
+if __name__ == '__main__':
+    _main()
@@ -10,15 +10,17 @@ commonly used Color objects defined in the color module.
 import time
 import os
 import sys
+import hashlib
+from collections import OrderedDict, deque
 
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = 'hide'
 import pygame
 import pygame.gfxdraw
 import pygame.font
 
-import tkinter as Tkinter
-import tkinter.messagebox as tkMessageBox
-import tkinter.filedialog as tkFileDialog
+# numpy is imported by the batched drawing functions, and tkinter by the
+# dialog boxes displayed in child processes, when they are first needed,
+# so that importing this module stays fast.
 	
 #-----------------------------------------------------------------------
 
@@ -61,6 +63,9 @@ _DEFAULT_PEN_COLOR = BLACK
 
 _DEFAULT_FONT_FAMILY = 'Helvetica'
 _DEFAULT_FONT_SIZE = 12
+_DEFAULT_TEXT_CACHE_SIZE = 256
+_KEY_QUEUE_SIZE = 256
+_FONT_CACHE_SIZE = 32
 
 _xmin = None
 _ymin = None
@@ -70,15 +75,39 @@ _ymax = None
 _fontFamily = _DEFAULT_FONT_FAMILY
 _fontSize = _DEFAULT_FONT_SIZE
 
+# Caches of the pygame fonts, keyed by (family, size, bold), and of the
+# rendered text surfaces, keyed by the font, the string and the color.
+# Both are ordered from the least to the most recently used.
+_fontCache = OrderedDict()
+_textCache = OrderedDict()
+_textCacheSize = _DEFAULT_TEXT_CACHE_SIZE
+
 _canvasWidth = float(_DEFAULT_CANVAS_SIZE)
 _canvasHeight = float(_DEFAULT_CANVAS_SIZE)
 _penRadius = None
 _penColor = _DEFAULT_PEN_COLOR
-_keysTyped = []
+
+# The keys typed (the most recent first), and the key events as
+# (time, pressed, key) tuples (the oldest first). Both queues keep only
+# the most recent _KEY_QUEUE_SIZE entries when they are not read.
+_keysTyped = deque(maxlen=_KEY_QUEUE_SIZE)
+_keyEvents = deque(maxlen=_KEY_QUEUE_SIZE)
 
 # Has the window been created?
 _windowCreated = False
 
+# Is the drawing done off-screen (without a window, see setHeadless())?
+_headless = False
+
+# The functions called with the window canvas each time a frame is shown
+# (see addFrameListener()).
+_frameListeners = []
+
+# Sprites and layers rendered off-screen by sprite() and layer(), keyed
+# by the keys given by the clients. The cache is emptied when the canvas
+# size or scale changes.
+_spriteCache = {}
+
 #-----------------------------------------------------------------------
 # Begin added by Alan J. Broder
 #-----------------------------------------------------------------------
@@ -100,12 +129,15 @@ _mousePos = None
 def _pygameColor(c):
     """
     Convert c, an object of type color.Color, to an equivalent object
-    of type pygame.Color.  Return the result.
+    of type pygame.Color.  Return the result.  The result is kept in c,
+    so each color is converted only once and the drawing functions do
+    not create a pygame.Color on each call.
     """
-    r = c.getRed()
-    g = c.getGreen()
-    b = c.getBlue()
-    return pygame.Color(r, g, b)
+    pc = c._pygameColor
+    if pc is None:
+        pc = pygame.Color(c.getRed(), c.getGreen(), c.getBlue())
+        c._pygameColor = pc
+    return pc
 
 #-----------------------------------------------------------------------
 
@@ -159,10 +191,15 @@ def setCanvasSize(w=_DEFAULT_CANVAS_SIZE, h=_DEFAULT_CANVAS_SIZE):
 
     _canvasWidth = w
     _canvasHeight = h
-    _background = pygame.display.set_mode([w, h])
-    pygame.display.set_caption('stddraw window (r-click to save)')
+    if _headless:
+        # The window canvas is an in-memory surface.
+        _background = pygame.Surface((w, h))
+    else:
+        _background = pygame.display.set_mode([w, h])
+        pygame.display.set_caption('stddraw window (r-click to save)')
     _surface = pygame.Surface((w, h))
     _surface.fill(_pygameColor(WHITE))
+    _spriteCache.clear()
     _windowCreated = True
 
 def setXscale(min=_DEFAULT_XMIN, max=_DEFAULT_XMAX):
@@ -179,6 +216,7 @@ def setXscale(min=_DEFAULT_XMIN, max=_DEFAULT_XMAX):
     size = max - min
     _xmin = min - _BORDER * size
     _xmax = max + _BORDER * size
+    _spriteCache.clear()
 
 def setYscale(min=_DEFAULT_YMIN, max=_DEFAULT_YMAX):
     """
@@ -194,6 +232,7 @@ def setYscale(min=_DEFAULT_YMIN, max=_DEFAULT_YMAX):
     size = max - min
     _ymin = min - _BORDER * size
     _ymax = max + _BORDER * size
+    _spriteCache.clear()
 
 def setPenRadius(r=_DEFAULT_PEN_RADIUS):
     """
@@ -230,8 +269,63 @@ def setFontSize(s=_DEFAULT_FONT_SIZE):
     global _fontSize
     _fontSize = s
 
+def setTextCacheSize(n=_DEFAULT_TEXT_CACHE_SIZE):
+    """
+    Set the maximum number of rendered strings kept in the text
+    cache to n (e.g. for the numbers on the tiles and the labels
+    drawn in every frame). If n is 0, then the text cache is not
+    used.
+    """
+    global _textCacheSize
+    if n < 0:
+        raise Exception('Argument to setTextCacheSize() must be non-neg')
+    _textCacheSize = n
+    while len(_textCache) > n:
+        _textCache.popitem(last=False)
+
 #-----------------------------------------------------------------------
 
+def setHeadless(headless=True):
+    """
+    If headless is True, draw off-screen: the window canvas is an
+    in-memory surface, so no window is ever created, no events are
+    read and show() does not wait (e.g. for rendering frames on a
+    machine without a display). The frames can then be read with
+    pixels(), frameHash() or save(). Calling this function is
+    optional. If you call it, you must do so before calling any
+    drawing function.
+    """
+    global _headless
+    if _windowCreated:
+        raise Exception('The stddraw window already was created')
+    _headless = headless
+
+def isHeadless():
+    """
+    Return True if stddraw draws off-screen (see setHeadless()), and
+    False otherwise.
+    """
+    return _headless
+
+def pixels():
+    """
+    Return the pixels of the window canvas (the last frame shown) as
+    a NumPy array of shape (width, height, 3) indexed by [x][y] that
+    refers to the pixels directly instead of copying them. The
+    canvas is locked while the array exists, so delete the array
+    before showing the next frame.
+    """
+    _makeSureWindowCreated()
+    return pygame.surfarray.pixels3d(_background)
+
+def frameHash():
+    """
+    Return the hash (a SHA-1 hex digest) of the RGB pixels of the
+    window canvas (the last frame shown), e.g. to compare frames.
+    """
+    _makeSureWindowCreated()
+    return hashlib.sha1(pygame.image.tostring(_background, 'RGB')).hexdigest()
+
 def _makeSureWindowCreated():
     global _windowCreated
     if not _windowCreated:
@@ -415,6 +509,59 @@ def filledSquare(x, y, r):
     _makeSureWindowCreated()
     filledRectangle(x-r, y-r, 2.0*r, 2.0*r)
 
+def squares(xs, ys, r):
+    """
+    Draw on the background canvas squares whose sides are of length
+    2r, centered on (xs[i], ys[i]) for each i. xs and ys are
+    sequences (or NumPy arrays) of the same length. This draws the
+    same squares as calling square() for each i, but the coordinates
+    are scaled once for all the squares.
+    """
+    import numpy
+    _makeSureWindowCreated()
+    ws = _factorX(2.0*r)
+    hs = _factorY(2.0*r)
+    xs = _scaleX(numpy.asarray(xs, dtype=float) - r)
+    ys = _scaleY(numpy.asarray(ys, dtype=float) - r)
+    # If the squares are too small, then simply draw pixels.
+    if (ws <= 1.0) and (hs <= 1.0):
+        for xsi, ysi in zip(xs.tolist(), ys.tolist()):
+            pygame.gfxdraw.pixel(_surface, int(round(xsi)), int(round(ysi)),
+                _pygameColor(_penColor))
+        return
+    color = _pygameColor(_penColor)
+    width = int(round(_penRadius))
+    for xsi, ysi in zip(xs.tolist(), (ys - hs).tolist()):
+        pygame.draw.rect(_surface, color, pygame.Rect(xsi, ysi, ws, hs),
+            width)
+
+def filledSquares(xs, ys, r, colors=None):
+    """
+    Draw on the background canvas filled squares whose sides are of
+    length 2r, centered on (xs[i], ys[i]) and filled with colors[i]
+    (objects of class color.Color) for each i. xs, ys and colors are
+    sequences (or NumPy arrays) of the same length. colors defaults
+    to the pen color for all the squares. This draws the same
+    squares as calling filledSquare() for each i, but the
+    coordinates are scaled once for all the squares.
+    """
+    import numpy
+    _makeSureWindowCreated()
+    ws = _factorX(2.0*r)
+    hs = _factorY(2.0*r)
+    xs = _scaleX(numpy.asarray(xs, dtype=float) - r)
+    ys = _scaleY(numpy.asarray(ys, dtype=float) - r)
+    if colors is None:
+        colors = [_penColor] * len(xs)
+    # If the squares are too small, then simply draw pixels.
+    if (ws <= 1.0) and (hs <= 1.0):
+        for xsi, ysi, c in zip(xs.tolist(), ys.tolist(), colors):
+            pygame.gfxdraw.pixel(_surface, int(round(xsi)), int(round(ysi)),
+                _pygameColor(c))
+        return
+    for xsi, ysi, c in zip(xs.tolist(), (ys - hs).tolist(), colors):
+        _surface.fill(_pygameColor(c), pygame.Rect(xsi, ysi, ws, hs))
+
 def polygon(x, y):
     """
     Draw on the background canvas a polygon with coordinates
@@ -463,30 +610,198 @@ def text(x, y, s):
     """
     Draw string s on the background canvas centered at (x, y).
     """
-    _makeSureWindowCreated()
-    x = float(x)
-    y = float(y)
-    xs = _scaleX(x)
-    ys = _scaleY(y)
-    font = pygame.font.SysFont(_fontFamily, _fontSize)
-    text = font.render(s, 1, _pygameColor(_penColor))
-    textpos = text.get_rect(center=(xs, ys))
-    _surface.blit(text, textpos)
+    _text(x, y, s, False)
 
 def boldText(x, y, s):
     """
     Draw string s as a bold text on the background canvas centered at (x, y).
     """
+    _text(x, y, s, True)
+
+def texts(xs, ys, strings):
+    """
+    Draw strings[i] on the background canvas centered at
+    (xs[i], ys[i]) for each i. xs, ys and strings are sequences (or
+    NumPy arrays) of the same length. This draws the same texts as
+    calling text() for each i, but the coordinates are scaled once
+    for all the texts and the texts are drawn with a single blit
+    call.
+    """
+    import numpy
+    _makeSureWindowCreated()
+    xs = _scaleX(numpy.asarray(xs, dtype=float))
+    ys = _scaleY(numpy.asarray(ys, dtype=float))
+    blits = []
+    for xsi, ysi, s in zip(xs.tolist(), ys.tolist(), strings):
+        text = _renderText(s, False)
+        blits.append((text, text.get_rect(center=(xsi, ysi))))
+    _surface.blits(blits, False)
+
+def _text(x, y, s, bold):
+    """
+    Draw string s (as a bold text if bold is True) on the background
+    canvas centered at (x, y).
+    """
     _makeSureWindowCreated()
     x = float(x)
     y = float(y)
     xs = _scaleX(x)
     ys = _scaleY(y)
-    font = pygame.font.SysFont(_fontFamily, _fontSize, True)
-    text = font.render(s, 1, _pygameColor(_penColor))
+    text = _renderText(s, bold)
     textpos = text.get_rect(center=(xs, ys))
     _surface.blit(text, textpos)
 
+def _font(bold):
+    """
+    Return the pygame font for the current font family and size
+    (bold if bold is True). The fonts are kept in a bounded cache
+    with least recently used eviction, so that the system font
+    lookup is done only once for each font.
+    """
+    key = (_fontFamily, _fontSize, bold)
+    font = _fontCache.get(key)
+    if font is None:
+        font = pygame.font.SysFont(_fontFamily, _fontSize, bold)
+        _fontCache[key] = font
+        if len(_fontCache) > _FONT_CACHE_SIZE:
+            _fontCache.popitem(last=False)
+    else:
+        _fontCache.move_to_end(key)
+    return font
+
+def _renderText(s, bold):
+    """
+    Return the surface of string s rendered with the current font
+    and pen color (bold if bold is True). The surfaces of repeated
+    strings are kept in a bounded cache with least recently used
+    eviction (see setTextCacheSize()).
+    """
+    c = _penColor
+    key = (_fontFamily, _fontSize, bold, s,
+        c.getRed(), c.getGreen(), c.getBlue())
+    text = _textCache.get(key)
+    if text is None:
+        text = _font(bold).render(s, 1, _pygameColor(c))
+        if _textCacheSize > 0:
+            _textCache[key] = text
+            if len(_textCache) > _textCacheSize:
+                _textCache.popitem(last=False)
+    else:
+        _textCache.move_to_end(key)
+    return text
+
+def sprite(key, x, y, w, h, draw):
+    """
+    Draw on the background canvas the sprite identified by key in
+    the rectangle of width w and height h whose lower left point is
+    (x, y). The first time a key is drawn, the function draw is
+    called (with no arguments) to render the sprite at (x, y) with
+    the other drawing functions of this module into an off-screen
+    surface of the size of the rectangle; the surface is then cached,
+    so that drawing the same key again takes a single blit. The key
+    should identify everything that affects the drawing except the
+    position (e.g. a value, a size and a style).
+    """
+    _makeSureWindowCreated()
+    size = _spriteSize(w, h)
+    rect = pygame.Rect((int(round(_scaleX(float(x)))),
+        int(round(_scaleY(float(y) + float(h))))), size)
+    spriteSurface = _spriteCache.get(key)
+    if spriteSurface is None:
+        spriteSurface = _renderSprite(key, rect, draw)
+    _surface.blit(spriteSurface, rect)
+
+def sprites(keys, xs, ys, w, h, draw):
+    """
+    Draw on the background canvas the sprites identified by keys[i]
+    in the rectangles of width w and height h whose lower left points
+    are (xs[i], ys[i]) for each i. keys, xs and ys are sequences (or
+    NumPy arrays) of the same length. The sprites are cached as in
+    sprite(); the function draw is called with i as its argument to
+    render the sprite of keys[i] at (xs[i], ys[i]) the first time that
+    key is drawn. The coordinates are scaled once for all the sprites
+    and the sprites are drawn with a single blit call.
+    """
+    import numpy
+    _makeSureWindowCreated()
+    size = _spriteSize(w, h)
+    lefts = numpy.round(_scaleX(numpy.asarray(xs, dtype=float)))
+    tops = numpy.round(_scaleY(numpy.asarray(ys, dtype=float) + float(h)))
+    blits = []
+    for i, (key, left, top) in enumerate(zip(keys, lefts.astype(int).tolist(),
+        tops.astype(int).tolist())):
+        rect = pygame.Rect((left, top), size)
+        spriteSurface = _spriteCache.get(key)
+        if spriteSurface is None:
+            spriteSurface = _renderSprite(key, rect, lambda: draw(i))
+        blits.append((spriteSurface, rect))
+    _surface.blits(blits, False)
+
+def _spriteSize(w, h):
+    """
+    Return the size in pixels of the sprites of width w and height h.
+    All the sprites of a size are drawn with the same number of
+    pixels wherever they are drawn.
+    """
+    return (int(round(_factorX(float(w)))), int(round(_factorY(float(h)))))
+
+def _renderSprite(key, rect, draw):
+    """
+    Render the sprite identified by key by calling the function draw
+    to draw it in the pygame.Rect rect, cache it, and return it.
+    """
+    global _surface, _xmin, _xmax, _ymin, _ymax
+    # Render into a transparent off-screen surface of the size of the
+    # sprite, with the scale moved so that the top left corner of rect
+    # is drawn at the top left corner of the surface. The whole sprite
+    # is rendered even if rect is partly outside the canvas.
+    canvas = _surface
+    scale = (_xmin, _xmax, _ymin, _ymax)
+    dx = rect.left * (_xmax - _xmin) / _canvasWidth
+    dy = rect.top * (_ymax - _ymin) / _canvasHeight
+    _surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+    _xmin, _xmax = _xmin + dx, _xmax + dx
+    _ymin, _ymax = _ymin - dy, _ymax - dy
+    try:
+        draw()
+        spriteSurface = _surface
+    finally:
+        _surface = canvas
+        _xmin, _xmax, _ymin, _ymax = scale
+    _spriteCache[key] = spriteSurface
+    return spriteSurface
+
+def layer(key, draw, x=None, y=None, w=None, h=None):
+    """
+    Draw on the background canvas the layer identified by key, a
+    static image of the size of the whole canvas (e.g. the lines and
+    the labels drawn behind everything else). The first time a key
+    is drawn, the function draw is called (with no arguments) to
+    render the layer with the other drawing functions of this module
+    into an off-screen surface which is then cached until the size or
+    the scale of the canvas changes. If x, y, w and h are given, only
+    the rectangle of width w and height h whose lower left point is
+    (x, y) is drawn (e.g. to erase a part of the canvas back to the
+    layer).
+    """
+    global _surface
+    _makeSureWindowCreated()
+    layerSurface = _spriteCache.get(key)
+    if layerSurface is None:
+        canvas = _surface
+        _surface = pygame.Surface(canvas.get_size(), 0, canvas)
+        try:
+            draw()
+            layerSurface = _surface
+        finally:
+            _surface = canvas
+        _spriteCache[key] = layerSurface
+    if x is None:
+        _surface.blit(layerSurface, (0, 0))
+    else:
+        rect = _pixelRect(x, y, w, h)
+        _surface.blit(layerSurface, rect, rect)
+
 def picture(pic, x=None, y=None):
     """
     Draw pic on the background canvas centered at (x, y).  pic is an
@@ -542,7 +857,9 @@ def _show():
     Copy the background canvas to the window canvas.
     """
     _background.blit(_surface, (0, 0))
-    pygame.display.flip()
+    if not _headless:
+        pygame.display.flip()
+    _notifyFrameListeners()
     _checkForEvents()
 
 def _showAndWaitForever():
@@ -552,6 +869,8 @@ def _showAndWaitForever():
     """
     _makeSureWindowCreated()
     _show()
+    if _headless:
+        return
     QUANTUM = .1
     while True:
         time.sleep(QUANTUM)
@@ -568,9 +887,112 @@ def show(msec=float('inf')):
     _makeSureWindowCreated()
     _show()
     _checkForEvents()
+    _wait(msec)
 
-    # Sleep for the required time, but check for events every
-    # QUANTUM seconds.
+def showRegions(regions, msec=0.0):
+    """
+    Copy only the given regions of the background canvas to the
+    window canvas, and then wait for msec milliseconds. regions is
+    a list of (x, y, w, h) rectangles, each of width w and height h
+    whose lower left point is (x, y). Use this instead of show()
+    when only a small part of the drawing has changed since the
+    last time it was shown.
+    """
+    _makeSureWindowCreated()
+    rects = [_pixelRect(x, y, w, h, 1) for (x, y, w, h) in regions]
+    for rect in rects:
+        _background.blit(_surface, rect, rect)
+    if rects:
+        if not _headless:
+            pygame.display.update(rects)
+        # The frame listeners are not called when nothing has changed.
+        _notifyFrameListeners()
+    _checkForEvents()
+    _wait(msec)
+
+def addFrameListener(listener):
+    """
+    Call the function listener with the window canvas (a
+    pygame.Surface) each time a frame is shown by show() or
+    showRegions() (but not when showRegions() is called with no
+    regions), e.g. to record the frames. The listener is called
+    in the drawing thread, so it should return quickly and it should
+    copy the surface if it keeps the pixels.
+    """
+    _frameListeners.append(listener)
+
+def removeFrameListener(listener):
+    """
+    Stop calling the function listener when a frame is shown.
+    """
+    _frameListeners.remove(listener)
+
+def _notifyFrameListeners():
+    """
+    Call the frame listeners with the window canvas.
+    """
+    for listener in _frameListeners:
+        listener(_background)
+
+def pollEvents():
+    """
+    Check for new events (such as a key typed or a mouse button
+    pressed) without copying the background canvas to the window
+    canvas and without waiting. Use this to read the input more
+    often than the window canvas is shown.
+    """
+    _makeSureWindowCreated()
+    _checkForEvents()
+
+def waitForEvents(msec=None):
+    """
+    Wait until a new event occurs (such as a key typed or a mouse
+    button pressed), but for at most msec milliseconds if msec is not
+    None, and then check for the new events. Return True if an event
+    has occurred, and False otherwise. Unlike show(), this does not
+    use the processor while waiting, so use this in the loops that
+    only react to the user (e.g. menus). In headless mode no event
+    ever occurs, so this sleeps for msec milliseconds and returns
+    False (and raises an Exception if msec is None).
+    """
+    _makeSureWindowCreated()
+    if _headless:
+        if msec is None:
+            raise Exception('No event can occur in headless mode')
+        time.sleep(msec / 1000.0)
+        return False
+    if msec is None:
+        event = pygame.event.wait()
+    else:
+        event = pygame.event.wait(int(msec))
+    if event.type == pygame.NOEVENT:
+        return False
+    _checkForEvents(event)
+    return True
+
+def _pixelRect(x, y, w, h, margin=0):
+    """
+    Return the pygame.Rect of the pixels covered by the rectangle
+    of width w and height h whose lower left point is (x, y), grown
+    by margin pixels on each side.
+    """
+    xs = _scaleX(float(x))
+    ys = _scaleY(float(y) + float(h))
+    ws = _factorX(float(w))
+    hs = _factorY(float(h))
+    left = int(round(xs)) - margin
+    top = int(round(ys)) - margin
+    right = int(round(xs + ws)) + margin
+    bottom = int(round(ys + hs)) + margin
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+def _wait(msec):
+    """
+    Sleep for msec milliseconds, but check for events every
+    QUANTUM seconds.
+    """
+    if _headless:
+        return
     QUANTUM = .01
     sec = msec / 1000.0
     if sec < QUANTUM:
@@ -624,13 +1046,16 @@ def _saveToFile():
         childProcess = subprocess.Popen(
             [sys.executable, stddrawPath, 'reportFileSaveError', str(e)])
 
-def _checkForEvents():
+def _checkForEvents(firstEvent=None):
     """
     Check if any new event has occured (such as a key typed or button
     pressed).  If a key has been typed, then put that key in a queue.
+    The key presses and releases are also put, with the time at which
+    they are read, in the queue of the key events. If firstEvent is
+    not None, it is an event already taken from the pygame event
+    queue that is handled before the others.
     """
     global _surface
-    global _keysTyped
     
     #-------------------------------------------------------------------
     # Begin added by Alan J. Broder
@@ -642,12 +1067,22 @@ def _checkForEvents():
     #-------------------------------------------------------------------
     
     _makeSureWindowCreated()
+    if _headless:
+        return
 
-    for event in pygame.event.get():
+    now = time.perf_counter()
+    events = pygame.event.get()
+    if firstEvent is not None:
+        events.insert(0, firstEvent)
+    for event in events:
         if event.type == pygame.QUIT:
             sys.exit()
         elif event.type == pygame.KEYDOWN:
-            _keysTyped = [pygame.key.name(event.key)] + _keysTyped
+            key = pygame.key.name(event.key)
+            _keysTyped.appendleft(key)
+            _keyEvents.append((now, True, key))
+        elif event.type == pygame.KEYUP:
+            _keyEvents.append((now, False, pygame.key.name(event.key)))
         elif (event.type == pygame.MOUSEBUTTONUP) and \
             (event.button == 3):
             _saveToFile()
@@ -674,23 +1109,43 @@ def hasNextKeyTyped():
     Return True if the queue of the keys the user typed is not empty.
     Otherwise return False.
     """
-    global _keysTyped
-    return _keysTyped != []
+    return len(_keysTyped) != 0
 
 def nextKeyTyped():
     """
     Remove the first key from the queue of the keys that the user typed,
     and return that key.
     """
-    global _keysTyped
     return _keysTyped.pop()
 
 def clearKeysTyped():
     """
     Clear all the keys in the queue of the keys that the user typed.
     """
-    global _keysTyped
-    _keysTyped = []
+    _keysTyped.clear()
+
+def hasNextKeyEvent():
+    """
+    Return True if the queue of the key events (the keys pressed and
+    released by the user) is not empty. Otherwise return False.
+    """
+    return len(_keyEvents) != 0
+
+def nextKeyEvent():
+    """
+    Remove the oldest event from the queue of the key events, and
+    return it as a (t, pressed, key) tuple, where t is the time (in
+    seconds, as given by time.perf_counter()) at which the event was
+    read, pressed is True for a key press and False for a key
+    release, and key is the name of the key.
+    """
+    return _keyEvents.popleft()
+
+def clearKeyEvents():
+    """
+    Clear all the events in the queue of the key events.
+    """
+    _keyEvents.clear()
 
 #-----------------------------------------------------------------------
 # Begin added by Alan J. Broder
@@ -756,9 +1211,11 @@ def _getFileName():
     """
     Display a dialog box that asks the user for a file name.
     """
-    root = Tkinter.Tk()
+    import tkinter
+    import tkinter.filedialog
+    root = tkinter.Tk()
     root.withdraw()
-    reply = tkFileDialog.asksaveasfilename(initialdir='.')
+    reply = tkinter.filedialog.asksaveasfilename(initialdir='.')
     sys.stdout.write(reply)
     sys.stdout.flush()
     sys.exit()
@@ -767,9 +1224,11 @@ def _confirmFileSave():
     """
     Display a dialog box that confirms a file save operation.
     """
-    root = Tkinter.Tk()
+    import tkinter
+    import tkinter.messagebox
+    root = tkinter.Tk()
     root.withdraw()
-    tkMessageBox.showinfo(title='File Save Confirmation',
+    tkinter.messagebox.showinfo(title='File Save Confirmation',
         message='The drawing was saved to the file.')
     sys.exit()
 
@@ -778,9 +1237,11 @@ def _reportFileSaveError(msg):
     Display a dialog box that reports a msg.  msg is a string which
     describes an error in a file save operation.
     """
-    root = Tkinter.Tk()
+    import tkinter
+    import tkinter.messagebox
+    root = tkinter.Tk()
     root.withdraw()
-    tkMessageBox.showerror(title='File Save Error', message=msg)
+    tkinter.messagebox.showerror(title='File Save Error', message=msg)
     sys.exit()
 
 #-----------------------------------------------------------------------
@@ -1,19 +1,65 @@
-import sys
 import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
-from lib.picture import Picture  # used for displaying images
-from lib.color import Color  # used for coloring the game menu
-import os  # the os module is used for file and directory operations
-from game_grid import GameGrid  # the class for modeling the game grid
-from tetromino import Tetromino  # the class for modeling the tetrominoes
-import random  # used for creating tetrominoes with random types/shapes
+import assets  # used for the images loaded once and shared
+from menu import Menu, Button  # used for displaying the menus
+from session import GameSession  # the game grid and the tetrominoes
+import time  # used for timing the ticks and the frames of the game loop
+import argparse  # used for parsing the command-line options
+import atexit  # used for finishing the recording when the program exits
+from input_handler import InputHandler  # used for reading the keyboard
+from latency import LatencyTracker  # used for measuring the input latency
+
+# The maximum number of frames rendered per second
+FRAME_RATE = 60
+# The interval (in ms) between two checks of the keyboard
+INPUT_POLL_MS = 5
+# The maximum number of simulation ticks run at once to catch up after a delay
+MAX_CATCH_UP_TICKS = 5
 
 
 # MAIN FUNCTION OF THE PROGRAM
 # -------------------------------------------------------------------------------
-# Main function where this program starts execution
-def start():
+# Main function where this program starts execution (the frames shown are
+# recorded into record_path when it is given, see lib/recorder.py, the
+# input-to-display latency is shown over the game grid when show_latency is
+# True and its summary is saved to latency_report when it is given)
+def start(record_path=None, show_latency=False, latency_report=None):
     # set the dimensions of the game grid
     grid_h, grid_w = 20, 17
+    setup(grid_h, grid_w)
+
+    # record the frames in the background until the program exits (the
+    # recorder and multiprocessing are imported only when they are used)
+    if record_path is not None:
+        from lib.recorder import FrameRecorder
+        recorder = FrameRecorder(record_path)
+        recorder.start()
+        atexit.register(recorder.stop)
+
+    # create the game session (the game grid and the tetrominoes)
+    session = GameSession(20, 12)
+    grid = session.grid
+
+    # measure the time from each key to the frame that shows its effect
+    grid.latency = LatencyTracker()
+    grid.show_latency = show_latency
+    if latency_report is not None:
+        atexit.register(grid.latency.save_report, latency_report)
+
+    # play the games in the same window until the program ends (a restarted
+    # game starts again from the game menu)
+    while True:
+        # display a simple menu before opening the game
+        # by using the display_game_menu function defined below
+        grid.level = display_game_menu(grid_h, grid_w)
+        play(session, grid_h, grid_w)
+        session.reset()
+
+
+# Function used for preparing the window for a game grid of the given size
+# (also used by startup_benchmark.py for measuring the time to the first frame)
+def setup(grid_h, grid_w):
+    # start loading the images of the menus in the background
+    assets.preload()
     # set the size of the drawing canvas
     canvas_h, canvas_w = 40 * grid_h, 40 * grid_w
     stddraw.setCanvasSize(canvas_w, canvas_h)
@@ -21,247 +67,182 @@ def start():
     stddraw.setXscale(-0.5, grid_w - 0.5)
     stddraw.setYscale(-0.5, grid_h - 0.5)
 
-    # set the dimension values stored and used in the Tetromino class
-    Tetromino.grid_height = 20
-    Tetromino.grid_width = 12
-
-    # create the game grid
-    grid = GameGrid(20, 12)
-    # create the first tetromino to enter the game grid
-    # by using the create_tetromino function defined below
-    current_tetromino = create_tetromino(grid_h, grid_w)
-    grid.current_tetromino = current_tetromino
-
-    next_tetromino = create_tetromino(grid_h, grid_w)
-    grid.next_tetromino = next_tetromino
-
-    # display a simple menu before opening the game
-    # by using the display_game_menu function defined below
-    grid.level = display_game_menu(grid_h, grid_w)
 
-    # the main game loop (keyboard interaction for moving the tetromino)
+# Function for playing a game of the given session until it is restarted (from
+# the pause menu or the game over menu)
+def play(session, grid_h, grid_w):
+    grid = session.grid
+    # the main game loop with a fixed timestep: the simulation (auto fall) runs
+    # one tick every grid.level ms, the keyboard is polled every INPUT_POLL_MS
+    # ms (all the keys pressed are handled) and the frames are rendered at
+    # most FRAME_RATE times per second, so the speed of the game does not
+    # depend on the input or the rendering
+    tick_time = grid.level / 1000
+    frame_time = 1 / FRAME_RATE
+    # the keyboard is read with delayed auto shift and auto repeat for the
+    # held keys (see input_handler.py)
+    keyboard = InputHandler()
+    keyboard.clear()
+    next_tick = time.perf_counter() + tick_time
+    next_frame = time.perf_counter()
     while True:
-        # check user interactions via the keyboard
-        if stddraw.hasNextKeyTyped():  # check if the user has pressed a key
-            key_typed = stddraw.nextKeyTyped()  # the most recently pressed key
+        # handle every key pressed since the last poll (and the repeats of the
+        # held keys) in the order in which they were pressed
+        for key_time, key_typed in keyboard.poll():
+            current_tetromino = grid.current_tetromino
+            # whether the key has changed the game (to measure its latency)
+            moved = False
             # if the left arrow key has been pressed
             if key_typed == "left":
                 # move the active tetromino left by one
-                current_tetromino.move(key_typed, grid)
+                moved = current_tetromino.move(key_typed, grid)
                 # if the right arrow key has been pressed
             elif key_typed == "right":
                 # move the active tetromino right by one
-                current_tetromino.move(key_typed, grid)
+                moved = current_tetromino.move(key_typed, grid)
             # if the down arrow key has been pressed
             elif key_typed == "down":
                 # move the active tetromino down by one
                 # (soft drop: causes the tetromino to fall down faster)
-                current_tetromino.move(key_typed, grid)
+                moved = current_tetromino.move(key_typed, grid)
             elif key_typed == "space":
-                current_tetromino.move(key_typed, grid)
+                moved = current_tetromino.move(key_typed, grid)
+            # if the up arrow key has been pressed
+            elif key_typed == "up":
+                # drop the active tetromino straight down until it lands
+                # (hard drop: it is locked by the next auto fall)
+                moved = current_tetromino.hard_drop(grid)
             elif key_typed == "escape":
-                pause(grid_h, grid_w)
-
-            # clear the queue of the pressed keys for a smoother interaction
-            stddraw.clearKeysTyped()
-
-        # move the active tetromino down by one at each iteration (auto fall)
-        success = current_tetromino.move("down", grid)
-
-        # place the active tetromino on the grid when it cannot go down anymore
-        if not success:
-            # get the tile matrix of the tetromino without empty rows and columns
-            # and the position of the bottom left cell in this matrix
-            tiles, pos = grid.current_tetromino.get_min_bounded_tile_matrix(True)
-            # update the game grid by locking the tiles of the landed tetromino
-            game_over = grid.update_grid(tiles, pos)
-            # end the main game loop if the game is over
-            if game_over:
-                grid.gameOver()
-            # create the next tetromino to enter the game grid
-            # by using the create_tetromino function defined below
-
-            current_tetromino = next_tetromino
-            next_tetromino = create_tetromino(grid_h, grid_w)
-            grid.next_tetromino = next_tetromino
-            grid.current_tetromino = current_tetromino
-        # display the game grid and the current tetromino
-
-        grid.merge()
-        grid.clearRows()
-        grid.display()
-        grid.drop_isolated()
-        grid.drop_isolated_twins()
-
-
-# Function for creating random shaped tetrominoes to enter the game grid
-def create_tetromino(grid_height, grid_width):
-    # type (shape) of the tetromino is determined randomly
-    tetromino_types = ['I', 'O', 'Z', 'L', 'J', 'S', 'T']
-    random_index = random.randint(0, len(tetromino_types) - 1)
-    random_type = tetromino_types[random_index]
-    # create and return the tetromino
-    tetromino = Tetromino(random_type)
-
-    return tetromino
-
-
-def pause(grid_height, grid_width):
-    stddraw.clearKeysTyped()
-    background_color = Color(42, 69, 99)
-    button_color = Color(25, 255, 228)
-    text_color = Color(0, 255, 17)
-    # clear the background canvas to background_color
-    stddraw.clear(background_color)
-    # get the directory in which this python code file is placed
-    current_dir = os.path.dirname(os.path.realpath(__file__))
-    # path of the image file
-    img_file = current_dir + "/images/menu_image.png"
-    # center coordinates to display the image
-    img_center_x, img_center_y = (grid_width - 1) / 2, grid_height - 7
-    # image is represented using the Picture class
-    image_to_display = Picture(img_file)
-    # display the image
-    stddraw.picture(image_to_display, img_center_x, img_center_y)
-    # dimensions of the start game button
-    easy_button_w, easy_button_h = grid_width - 11, 1.5
-    normal_button_w, normal_button_h = grid_width - 11, 1.5
-    # coordinates of the bottom left corner of the start game button
-    easy_button_blc_x, easy_button_blc_y = img_center_x - easy_button_w / 2, 6
-    normal_button_blc_x, normal_button_blc_y = img_center_x - normal_button_w / 2, 4
-
-    # display the start game button as a filled rectangle
-    stddraw.setPenColor(button_color)
-    stddraw.filledRectangle(easy_button_blc_x, easy_button_blc_y, easy_button_w, easy_button_h)
-    stddraw.filledRectangle(normal_button_blc_x, normal_button_blc_y, normal_button_w, normal_button_h)
-    # display the text on the start game button
-    stddraw.setFontFamily("Arial")
-    stddraw.setFontSize(25)
-    stddraw.setPenColor(text_color)
-    text_to_display = "The Game is Paused"
-    stddraw.text(img_center_x, 9, text_to_display)
-
-    stddraw.setPenColor(Color(255, 0, 0))
-    easy = "Continue"
-    stddraw.text(img_center_x, 6.7, easy)
-    normal = "Restart"
-    stddraw.text(img_center_x, 4.7, normal)
-    while True:
-        # display the menu and wait for a short time (50 ms)
-        stddraw.show(50)
-        # check if the mouse has been left-clicked on the button
-        if stddraw.mousePressed():
-            # get the x and y coordinates of the location at which the mouse has
-            # most recently been left-clicked
-            mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
-            # check if these coordinates are inside the button
-            if easy_button_blc_x <= mouse_x <= easy_button_blc_x + easy_button_w:
-                if easy_button_blc_y <= mouse_y <= easy_button_blc_y + easy_button_h:
-                    break
-                elif normal_button_blc_y <= mouse_y <= normal_button_blc_y + normal_button_h:
-                    os.execl(sys.executable, sys.executable, *sys.argv)
-
-
-def display_options(grid_height, grid_width, grid=None):
-    # colors used for the menu
-    background_color = Color(42, 69, 99)
-    # clear the background canvas to background_color
-    stddraw.clear(background_color)
-    # get the directory in which this python code file is placed
-    current_dir = os.path.dirname(os.path.realpath(__file__))
-    # path of the image file
-    img_file = current_dir + "/images/Options.png"
-    # center coordinates to display the image
-    img_center_x, img_center_y = (grid_width - 1) / 2, grid_height - 10
-    # image is represented using the Picture class
-    image_to_display = Picture(img_file)
-    # display the image
-    stddraw.picture(image_to_display, img_center_x, img_center_y)
-
-    while True:
-        stddraw.show(50)
-        # check user interactions via the keyboard
-        if stddraw.hasNextKeyTyped():  # check if the user has pressed a key
-            key_typed = stddraw.nextKeyTyped()  # the most recently pressed key
-            # if the left arrow key has been pressed
-            if key_typed == "escape":
-                display_game_menu(grid_height, grid_width)
+                if pause(grid_h, grid_w) == "restart":
+                    return
+                # the pause menu is drawn over the game grid
+                grid.renderer.invalidate()
+                # forget the keys pressed before and during the pause
+                keyboard.clear()
+                # restart the clock so that the paused time is not caught up
+                next_tick = time.perf_counter() + tick_time
+                next_frame = time.perf_counter()
                 break
-        stddraw.clearKeysTyped()
-
-
-# Function for displaying a simple menu before starting the game
-def display_game_menu(grid_height, grid_width, grid=None):
-    # colors used for the menu
-    background_color = Color(42, 69, 99)
-    button_color = Color(25, 255, 228)
-    text_color = Color(0, 255, 17)
-    # clear the background canvas to background_color
-    stddraw.clear(background_color)
-    # get the directory in which this python code file is placed
-    current_dir = os.path.dirname(os.path.realpath(__file__))
-    # path of the image file
-    img_file = current_dir + "/images/menu_image.png"
-    # center coordinates to display the image
-    img_center_x, img_center_y = (grid_width - 1) / 2, grid_height - 7
-    # image is represented using the Picture class
-    image_to_display = Picture(img_file)
-    # display the image
-    stddraw.picture(image_to_display, img_center_x, img_center_y)
-    # dimensions of the start game button
-    easy_button_w, easy_button_h = grid_width - 11, 1.5
-    normal_button_w, normal_button_h = grid_width - 11, 1.5
-    hard_button_w, hard_button_h = grid_width - 11, 1.5
-    settings_w, settings_h = grid_width - 9, 1.5
-    # coordinates of the bottom left corner of the start game button
-    easy_button_blc_x, easy_button_blc_y = img_center_x - easy_button_w / 2, 6
-    normal_button_blc_x, normal_button_blc_y = img_center_x - normal_button_w / 2, 4
-    hard_button_blc_x, hard_button_blc_y = img_center_x - hard_button_w / 2, 2
-    settings_blc_x, settings_blc_y = img_center_x - settings_w / 2, 0
-    # display the start game button as a filled rectangle
-    stddraw.setPenColor(button_color)
-    stddraw.filledRectangle(easy_button_blc_x, easy_button_blc_y, easy_button_w, easy_button_h)
-    stddraw.filledRectangle(normal_button_blc_x, normal_button_blc_y, normal_button_w, normal_button_h)
-    stddraw.filledRectangle(hard_button_blc_x, hard_button_blc_y, hard_button_w, hard_button_h)
-    stddraw.filledRectangle(settings_blc_x, settings_blc_y, settings_w, settings_h)
-    # display the text on the start game button
-    stddraw.setFontFamily("Arial")
-    stddraw.setFontSize(25)
-    stddraw.setPenColor(text_color)
-    text_to_display = "Choose a Level for Start the Game"
-    stddraw.text(img_center_x, 9, text_to_display)
-
-    stddraw.setPenColor(Color(255, 0, 0))
-    easy = "EASY"
-    stddraw.text(img_center_x, 6.7, easy)
-    normal = "NORMAL"
-    stddraw.text(img_center_x, 4.7, normal)
-    hard = "HARD"
-    stddraw.text(img_center_x, 2.7, hard)
-    settings = "HOW TO PLAY"
-    stddraw.text(img_center_x, 0.7, settings)
-    # menu interaction loop
+            if moved:
+                grid.latency.input_applied(key_time)
+
+        # run the simulation ticks that are due (at most MAX_CATCH_UP_TICKS at
+        # once, the rest are skipped when the game falls far behind)
+        now = time.perf_counter()
+        ticks = 0
+        while now >= next_tick and ticks < MAX_CATCH_UP_TICKS:
+            if not tick(session):
+                return
+            next_tick += tick_time
+            ticks += 1
+        if now >= next_tick:
+            next_tick = now + tick_time
+
+        # display the game grid and the current tetromino when a frame is due
+        if now >= next_frame:
+            grid.display()
+            next_frame = max(next_frame + frame_time, now)
+
+        # sleep until the next tick, frame or input poll
+        wake_time = min(next_tick, next_frame, now + INPUT_POLL_MS / 1000)
+        time.sleep(max(0, wake_time - time.perf_counter()))
+
+
+# Function for running one simulation tick of the game: the active tetromino
+# is moved down by one (auto fall) and it is locked on the game grid when it
+# cannot go down anymore. Returns False when the game is over and it is to be
+# restarted, and True otherwise.
+def tick(session):
+    grid = session.grid
+    # move the active tetromino down by one at each tick (auto fall)
+    success = grid.current_tetromino.move("down", grid)
+
+    # place the active tetromino on the grid when it cannot go down anymore
+    if not success:
+        # get the tile matrix of the tetromino without empty rows and columns
+        # and the position of the bottom left cell in this matrix
+        tiles, pos = grid.current_tetromino.get_min_bounded_tile_matrix(True)
+        # update the game grid by locking the tiles of the landed tetromino
+        game_over = grid.update_grid(tiles, pos)
+        # end the game if it is over (the game over menu returns only when the
+        # game is to be restarted)
+        if game_over:
+            grid.gameOver()
+            return False
+        # resolve the merges, row clears and drops caused by the locked
+        # tiles (the ticks without a lock need no such post-processing)
+        grid.settle()
+        # the next tetromino enters the game grid and a new one is created
+        session.next_tetromino()
+    return True
+
+
+# Function for displaying the pause menu. Returns the action chosen: "continue"
+# or "restart".
+def pause(grid_height, grid_width):
+    # center coordinates of the menu
+    center_x = (grid_width - 1) / 2
+    button_w, button_h = grid_width - 11, 1.5
+    pause_menu = Menu("menu_image.png", center_x, grid_height - 7,
+                      texts=[(center_x, 9, "The Game is Paused")],
+                      buttons=[Button(center_x - button_w / 2, 6, button_w, button_h,
+                                      "Continue", "continue"),
+                               Button(center_x - button_w / 2, 4, button_w, button_h,
+                                      "Restart", "restart")])
+    return pause_menu.run()
+
+
+# Function for displaying how to play the game (until the escape key is pressed)
+def display_options(grid_height, grid_width):
+    options_screen = Menu("Options.png", (grid_width - 1) / 2, grid_height - 10,
+                          escape_action="back")
+    options_screen.run()
+
+
+# Function that returns the game menu displayed before starting the game (the
+# actions of the level buttons are the durations of their simulation ticks)
+def game_menu(grid_height, grid_width):
+    # center coordinates of the menu
+    center_x = (grid_width - 1) / 2
+    button_w, button_h = grid_width - 11, 1.5
+    settings_w = grid_width - 9
+    return Menu("menu_image.png", center_x, grid_height - 7,
+                texts=[(center_x, 9, "Choose a Level for Start the Game")],
+                buttons=[Button(center_x - button_w / 2, 6, button_w, button_h,
+                                "EASY", 250),
+                         Button(center_x - button_w / 2, 4, button_w, button_h,
+                                "NORMAL", 150),
+                         Button(center_x - button_w / 2, 2, button_w, button_h,
+                                "HARD", 50),
+                         Button(center_x - settings_w / 2, 0, settings_w, button_h,
+                                "HOW TO PLAY", "how to play")])
+
+
+# Function for displaying a simple menu before starting the game. Returns the
+# duration (in ms) of a simulation tick for the chosen level.
+def display_game_menu(grid_height, grid_width):
+    menu = game_menu(grid_height, grid_width)
+    # the game menu is displayed again after the how to play screen
     while True:
-        # display the menu and wait for a short time (50 ms)
-        stddraw.show(50)
-        # check if the mouse has been left-clicked on the button
-        if stddraw.mousePressed():
-            # get the x and y coordinates of the location at which the mouse has
-            # most recently been left-clicked
-            mouse_x, mouse_y = stddraw.mouseX(), stddraw.mouseY()
-            # check if these coordinates are inside the button
-            if easy_button_blc_x <= mouse_x <= easy_button_blc_x + easy_button_w:
-                if easy_button_blc_y <= mouse_y <= easy_button_blc_y + easy_button_h:
-                    return 250
-                elif normal_button_blc_y <= mouse_y <= normal_button_blc_y + normal_button_h:
-                    return 150
-                elif hard_button_blc_y <= mouse_y <= hard_button_blc_y + hard_button_h:
-                    return 50
-                elif settings_blc_y <= mouse_y <= settings_blc_y + settings_h:
-                    display_options(grid_height, grid_width)
+        action = menu.run()
+        if action == "how to play":
+            display_options(grid_height, grid_width)
+        else:
+            return action
 
 
 # start() function is specified as the entry point (main function) from which
 # the program starts execution
 if __name__ == '__main__':
-    start()
+    parser = argparse.ArgumentParser(description="Tetris 2048")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the frames into a directory of PNG files "
+                             "or an animated GIF file (PATH ending with .gif, "
+                             "which holds the first 500 frames at most)")
+    parser.add_argument("--latency", action="store_true",
+                        help="show the input-to-display latency over the game")
+    parser.add_argument("--latency-report", metavar="PATH",
+                        help="save the summary of the input-to-display latency "
+                             "(p50/p95/p99 in ms) to PATH as JSON on exit")
+    args = parser.parse_args()
+    start(args.record, args.latency, args.latency_report)
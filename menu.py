@@ -0,0 +1,89 @@
+from collections import namedtuple  # used for the buttons of the menus
+import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
+import palette  # the shared colors used for the menus
+import assets  # used for the images loaded once and shared
+
+# The time (in ms) a menu waits for an event before checking again
+WAIT_TIMEOUT = 500
+
+# A button of a menu: the position of its bottom left corner, its width and
+# height, its label and the action returned by the menu when it is clicked
+Button = namedtuple('Button', ['x', 'y', 'w', 'h', 'label', 'action'])
+
+
+# Class used for modelling the screens shown over the game (the game menu, the
+# pause and game over menus and the how to play screen): an image, some texts
+# and some buttons. A menu is drawn once and then it waits for the events of
+# the user without using the processor (the frame is shown again only after an
+# input), and it returns the action of the button clicked (or escape_action
+# when the escape key is pressed) to its caller, so the menus do not call each
+# other.
+class Menu:
+    # Constructor for creating a menu with the image with the given file name
+    # centered at (image_x, image_y), the given texts as (x, y, text) tuples,
+    # the given buttons and the action returned for the escape key (None when
+    # the escape key does nothing)
+    def __init__(self, image_name, image_x, image_y, texts=(), buttons=(),
+                 escape_action=None):
+        self.image_name = image_name
+        self.image_x, self.image_y = image_x, image_y
+        self.texts = texts
+        self.buttons = buttons
+        self.escape_action = escape_action
+
+    # Method for drawing the menu
+    def draw(self):
+        # clear the background canvas to the background color of the menus
+        stddraw.clear(palette.MENU_BACKGROUND_COLOR)
+        # display the image (it is loaded once and shared, see assets.py)
+        image_to_display = assets.picture(self.image_name)
+        stddraw.picture(image_to_display, self.image_x, self.image_y)
+        # display the buttons as filled rectangles
+        stddraw.setPenColor(palette.BUTTON_COLOR)
+        for button in self.buttons:
+            stddraw.filledRectangle(button.x, button.y, button.w, button.h)
+        # display the texts and the labels of the buttons
+        stddraw.setFontFamily("Arial")
+        stddraw.setFontSize(25)
+        stddraw.setPenColor(palette.MENU_TEXT_COLOR)
+        for x, y, text in self.texts:
+            stddraw.text(x, y, text)
+        stddraw.setPenColor(palette.BUTTON_TEXT_COLOR)
+        for button in self.buttons:
+            stddraw.text(button.x + button.w / 2, button.y + 0.7, button.label)
+
+    # Method that displays the menu until a button is clicked (or the escape
+    # key is pressed) and returns the action of the button (or escape_action)
+    def run(self):
+        # no input can reach the menu when stddraw draws off-screen, so the
+        # menu would wait forever
+        if stddraw.isHeadless():
+            raise Exception("A menu cannot be displayed in headless mode")
+        # forget the keys and the clicks made before the menu is displayed
+        stddraw.clearKeysTyped()
+        stddraw.mousePressed()
+        self.draw()
+        stddraw.show(0)
+        while True:
+            # wait for the next input of the user
+            if not stddraw.waitForEvents(WAIT_TIMEOUT):
+                continue
+            # check if a button has been clicked
+            if stddraw.mousePressed():
+                action = self.button_action(stddraw.mouseX(), stddraw.mouseY())
+                if action is not None:
+                    return action
+            # check if the escape key has been pressed
+            while stddraw.hasNextKeyTyped():
+                if stddraw.nextKeyTyped() == "escape" and self.escape_action is not None:
+                    return self.escape_action
+            # show the menu again after the input (e.g. when it has been covered)
+            stddraw.show(0)
+
+    # Method that returns the action of the button at the given position (or
+    # None if there is no button at this position)
+    def button_action(self, x, y):
+        for button in self.buttons:
+            if button.x <= x <= button.x + button.w and button.y <= y <= button.y + button.h:
+                return button.action
+        return None
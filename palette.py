@@ -0,0 +1,40 @@
+from lib.color import intern  # used for the shared (interned) Color objects
+
+
+# The colors used for drawing the game. Each color is a shared Color object
+# (see color.intern) that is converted to a pygame color only once when it is
+# first drawn, so no Color objects are created while drawing the frames.
+# ---------------------------------------------------------------------------
+# the colors of the game grid
+EMPTY_CELL_COLOR = intern(42, 69, 99)
+LINE_COLOR = intern(0, 100, 200)
+BOUNDARY_COLOR = LINE_COLOR
+# the colors of the labels and the score drawn next to the game grid
+LABEL_COLOR = intern(255, 255, 255)
+# the colors of the tiles (the background colors are given by TILE_COLORS)
+TILE_BOX_COLOR = LINE_COLOR
+TILE_NUMBER_COLOR = LINE_COLOR
+PREVIEW_TILE_COLOR = intern(61, 239, 215)
+# the colors of the menus
+MENU_BACKGROUND_COLOR = EMPTY_CELL_COLOR
+BUTTON_COLOR = intern(25, 255, 228)
+MENU_TEXT_COLOR = intern(0, 255, 17)
+BUTTON_TEXT_COLOR = intern(255, 0, 0)
+
+# The background colors of the tiles indexed by the tile values (the value of a
+# tile with the number 2 ** value, see core/cell.py), the tiles with larger
+# numbers than 2048 use the color of 2048
+TILE_COLORS = (
+    EMPTY_CELL_COLOR,  # EMPTY
+    intern(238, 228, 218), intern(238, 217, 177),  # 2, 4
+    intern(242, 177, 121), intern(245, 149, 99),  # 8, 16
+    intern(246, 124, 95), intern(246, 94, 59),  # 32, 64
+    intern(237, 207, 114), intern(237, 204, 97),  # 128, 256
+    intern(237, 200, 80), intern(237, 197, 63),  # 512, 1024
+    intern(237, 194, 46),  # 2048
+)
+
+
+# Function that returns the background color of the tiles with the given value
+def tile_color(value):
+    return TILE_COLORS[min(int(value), len(TILE_COLORS) - 1)]
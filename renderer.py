@@ -0,0 +1,58 @@
+import numpy as np  # fundamental Python module for scientific computing
+
+
+# Class used for drawing the game grid with dirty rectangles: it remembers what
+# was drawn in the last frame (the value in each grid cell including the active
+# tetromino, the score and the next tetromino) and redraws only the cells, the
+# score area and the preview area that have changed since then, so the cost of
+# a frame follows how much has changed rather than the size of the game grid
+class GridRenderer:
+    # Constructor for creating a renderer for the given game grid
+    def __init__(self, game_grid):
+        self.game_grid = game_grid
+        self.invalidate()
+
+    # Method used for forcing a full redraw in the next frame (e.g. after a menu
+    # has been drawn over the game grid)
+    def invalidate(self):
+        self.cells = None
+        self.score = None
+        self.next_type = None
+
+    # Method that returns the matrix of the tile values shown in each grid cell:
+    # the locked tiles and the tiles of the active tetromino inside the grid
+    def get_cells(self):
+        game_grid = self.game_grid
+        cells = game_grid.tile_matrix.copy()
+        if game_grid.current_tetromino is not None:
+            for position, value in game_grid.current_tetromino.get_tiles():
+                if 0 <= position.y < game_grid.grid_height:
+                    cells[position.y][position.x] = value
+        return cells
+
+    # Method used for drawing the changes since the last frame. Returns the list
+    # of the (x, y, w, h) regions redrawn to be shown by stddraw.showRegions, or
+    # None when the whole canvas has been redrawn.
+    def render(self):
+        game_grid = self.game_grid
+        cells = self.get_cells()
+        next_type = None
+        if game_grid.current_tetromino is not None and game_grid.next_tetromino is not None:
+            next_type = game_grid.next_tetromino.type
+        if self.cells is None:
+            game_grid.draw_frame()
+            regions = None
+        else:
+            regions = []
+            changed = np.argwhere(cells != self.cells)
+            for row, col in changed:
+                regions.append(game_grid.draw_cell(row, col, cells[row][col]))
+            # the box around the game grid is drawn over the outermost cells
+            if len(changed) != 0:
+                game_grid.draw_boundaries()
+            if game_grid.score != self.score:
+                regions.append(game_grid.draw_score())
+            if next_type != self.next_type:
+                regions.append(game_grid.draw_preview_area())
+        self.cells, self.score, self.next_type = cells, game_grid.score, next_type
+        return regions
@@ -0,0 +1,45 @@
+import random  # used for creating tetrominoes with random types/shapes
+from game_grid import GameGrid  # the class for modeling the game grid
+from tetromino import Tetromino  # the class for modeling the tetrominoes
+
+
+# Class used for modelling a game session: the game grid with its score and the
+# queue of the tetrominoes (the active one and the next one). A new game is
+# started in place with the reset method, so restarting the game reuses the
+# window, the fonts, the cached sprites and the loaded images instead of
+# starting the program again.
+class GameSession:
+    # The types (shapes) of the tetrominoes
+    tetromino_types = ['I', 'O', 'Z', 'L', 'J', 'S', 'T']
+
+    # Constructor for creating a session with a game grid of the given size
+    def __init__(self, grid_h, grid_w):
+        # set the dimension values stored and used in the Tetromino class
+        Tetromino.grid_height = grid_h
+        Tetromino.grid_width = grid_w
+        # create the game grid
+        self.grid = GameGrid(grid_h, grid_w)
+        self.reset()
+
+    # Method used for starting a new game: the game grid and the score are
+    # cleared and new tetrominoes are created (the game level is kept until it
+    # is chosen again)
+    def reset(self):
+        self.grid.reset()
+        # create the first tetromino to enter the game grid and the next one
+        self.grid.current_tetromino = self.create_tetromino()
+        self.grid.next_tetromino = self.create_tetromino()
+
+    # Method used for moving the queue of the tetrominoes forward: the next
+    # tetromino enters the game grid and a new next tetromino is created
+    def next_tetromino(self):
+        self.grid.current_tetromino = self.grid.next_tetromino
+        self.grid.next_tetromino = self.create_tetromino()
+
+    # Method for creating random shaped tetrominoes to enter the game grid
+    def create_tetromino(self):
+        # type (shape) of the tetromino is determined randomly
+        random_index = random.randint(0, len(self.tetromino_types) - 1)
+        random_type = self.tetromino_types[random_index]
+        # create and return the tetromino
+        return Tetromino(random_type)
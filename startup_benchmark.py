@@ -0,0 +1,92 @@
+import time  # used for measuring the startup of the game
+import sys  # used for checking the imported modules and running the game
+import os  # used for the path of this file
+import json  # used for passing the measurements from the measured processes
+import argparse  # used for parsing the command-line options
+import subprocess  # used for measuring each startup in a new process
+import statistics  # used for the median of the measurements
+
+# The modules that should not be imported before they are needed
+LAZY_MODULES = ("tkinter", "multiprocessing")
+
+
+# Function used for measuring the startup of the game in this process: the time
+# (in ms) taken by importing the game modules and the time (in ms) until the
+# first frame (the game menu) has been presented, also from process_start (the
+# time.time() when the process was started) when it is given. The frame is
+# drawn into an off-screen canvas when headless is True. Returns the
+# measurements as a dictionary.
+def measure(headless=False, process_start=None):
+    start_time = time.perf_counter()
+    import main  # the game modules (and their dependencies) are imported here
+    import_time = time.perf_counter()
+    import lib.stddraw as stddraw
+    from session import GameSession
+    # the time of the first frame presented is recorded by a frame listener
+    frame_times = []
+    stddraw.addFrameListener(lambda surface: frame_times.append(
+        (time.perf_counter(), time.time())))
+    if headless:
+        stddraw.setHeadless()
+    # the same steps as main.start until the game menu is displayed
+    grid_h, grid_w = 20, 17
+    main.setup(grid_h, grid_w)
+    GameSession(20, 12)
+    main.game_menu(grid_h, grid_w).draw()
+    stddraw.show(0)
+    frame_time, frame_wall_time = frame_times[0]
+    result = {"import_ms": (import_time - start_time) * 1000,
+              "first_frame_ms": (frame_time - start_time) * 1000,
+              "loaded": [name for name in LAZY_MODULES if name in sys.modules]}
+    if process_start is not None:
+        result["process_ms"] = (frame_wall_time - process_start) * 1000
+    return result
+
+
+# Function used for measuring the startup of the game the given number of
+# times, each time in a new process (so that nothing has been imported yet).
+# The time from starting the process until the first frame (process_ms)
+# includes the startup of the interpreter. Returns the list of the
+# measurements.
+def run(runs, headless=False):
+    command = [sys.executable, os.path.realpath(__file__), "--once"]
+    if headless:
+        command.append("--headless")
+    results = []
+    for _ in range(runs):
+        # the process measures its first frame from the time it is started
+        output = subprocess.run(command + ["--started", repr(time.time())],
+                                stdout=subprocess.PIPE, check=True).stdout
+        results.append(json.loads(output.decode().strip().splitlines()[-1]))
+    return results
+
+
+# Function used for printing the summary (the median and the minimum) of the
+# given measurements
+def report(results):
+    print("startup of %d runs (ms)  median     min" % len(results))
+    for key, label in (("import_ms", "import"),
+                       ("first_frame_ms", "first frame"),
+                       ("process_ms", "process to first frame")):
+        values = [result[key] for result in results]
+        print("%-24s %7.1f %7.1f" % (label, statistics.median(values), min(values)))
+    loaded = sorted({name for result in results for name in result["loaded"]})
+    if loaded:
+        print("imported at startup: %s" % ", ".join(loaded))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Measure the import time and the time to the first frame of "
+                    "Tetris 2048")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="the number of startups measured (default: 5)")
+    parser.add_argument("--headless", action="store_true",
+                        help="draw the first frame without opening a window")
+    parser.add_argument("--once", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--started", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.once:
+        print(json.dumps(measure(args.headless, args.started)))
+    else:
+        report(run(args.runs, args.headless))
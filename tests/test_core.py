@@ -0,0 +1,122 @@
+import random  # used for building random game grids
+import numpy as np  # fundamental Python module for scientific computing
+import pytest  # the test runner
+from core import EMPTY, Grid, Piece, ClearResult, GravityResult
+from core.shapes import ROTATIONS  # the rotations of the tetromino types
+
+
+# Function that returns the row bitmasks and the column heights of the given
+# grid computed cell by cell from its tile matrix
+def expected_occupancy(grid):
+    row_masks = [sum(1 << col for col in range(grid.grid_width)
+                     if grid.tile_matrix[row][col] != EMPTY)
+                 for row in range(grid.grid_height)]
+    column_heights = [max([row + 1 for row in range(grid.grid_height)
+                           if grid.tile_matrix[row][col] != EMPTY], default=0)
+                      for col in range(grid.grid_width)]
+    return row_masks, column_heights
+
+
+# Function that returns a grid of the given size with random tiles placed by
+# set_tile (fewer tiles in the upper rows, so there are overhangs and holes)
+def random_grid(rng, grid_h, grid_w):
+    grid = Grid(grid_h, grid_w)
+    for row in range(grid_h):
+        for col in range(grid_w):
+            if rng.random() < 0.8 * (1 - row / grid_h):
+                grid.set_tile(row, col, rng.randint(1, 4))
+    return grid
+
+
+# Function that returns the landing row of the bottom left cell of the given
+# piece found by moving it down one row at a time while it fits
+def stepwise_landing(piece, grid):
+    x, y = piece.bottom_left_cell.x, piece.bottom_left_cell.y
+    while piece.fits(grid, piece.rotation, x, y - 1):
+        y -= 1
+    return y
+
+
+@pytest.mark.parametrize("grid_w", [12, 64, 70])
+def test_occupancy_matches_tile_matrix_after_settle(grid_w):
+    rng = random.Random(grid_w)
+    for _ in range(20):
+        grid = random_grid(rng, 20, grid_w)
+        assert (grid.row_masks, grid.column_heights) == expected_occupancy(grid)
+        grid.settle()
+        assert (grid.row_masks, grid.column_heights) == expected_occupancy(grid)
+
+
+def test_set_tile_keeps_occupancy_up_to_date():
+    rng = random.Random(1)
+    grid = Grid(10, 8)
+    for _ in range(500):
+        value = rng.choice([EMPTY, 1, 2])
+        grid.set_tile(rng.randrange(10), rng.randrange(8), value)
+        assert (grid.row_masks, grid.column_heights) == expected_occupancy(grid)
+
+
+def test_landing_position_matches_stepwise_fits():
+    rng = random.Random(2)
+    Piece.grid_height, Piece.grid_width = 20, 12
+    for _ in range(20):
+        grid = random_grid(rng, 20, 12)
+        for type in ROTATIONS:
+            piece = Piece(type)
+            for rotation in range(4):
+                piece.rotation = rotation
+                min_dx, max_dx = ROTATIONS[type][rotation].bounds[:2]
+                for x in range(-min_dx, 12 - max_dx):
+                    # dropped from above the game grid and from a random row
+                    # where the piece fits (possibly under an overhang)
+                    for y in (20, rng.randrange(20)):
+                        if not piece.fits(grid, rotation, x, y):
+                            continue
+                        piece.bottom_left_cell.x, piece.bottom_left_cell.y = x, y
+                        landing = piece.landing_position(grid)
+                        assert (landing.x, landing.y) == (x, stepwise_landing(piece, grid))
+
+
+def test_clear_rows_moves_the_remaining_rows_down():
+    grid = Grid(4, 3)
+    grid.tile_matrix[:] = [[1, 1, 1],
+                           [2, 0, 0],
+                           [1, 2, 3],
+                           [0, 3, 0]]
+    grid.update_occupancy()
+    assert grid.clearRows() == ClearResult(2, 2 + 2 + 2 + 2 + 4 + 8)
+    assert grid.score == 20
+    assert grid.tile_matrix.tolist() == [[2, 0, 0],
+                                         [0, 3, 0],
+                                         [0, 0, 0],
+                                         [0, 0, 0]]
+    assert (grid.row_masks, grid.column_heights) == expected_occupancy(grid)
+    assert grid.clearRows() == ClearResult(0, 0)
+
+
+def test_gravity_drops_a_floating_group():
+    grid = Grid(5, 3)
+    grid.set_tile(0, 0, 1)
+    # a group of three tiles floating above the empty cells of the bottom row
+    grid.set_tile(3, 1, 1)
+    grid.set_tile(3, 2, 2)
+    grid.set_tile(4, 2, 3)
+    assert grid.apply_gravity() == GravityResult(3, 3)
+    assert grid.tile_matrix.tolist() == [[1, 1, 2],
+                                         [0, 0, 3],
+                                         [0, 0, 0],
+                                         [0, 0, 0],
+                                         [0, 0, 0]]
+    assert (grid.row_masks, grid.column_heights) == expected_occupancy(grid)
+    assert grid.apply_gravity() == GravityResult(0, 0)
+
+
+def test_wide_grid_clears_a_full_row():
+    grid = Grid(3, 70)
+    grid.tile_matrix[0, :] = 1
+    grid.tile_matrix[1, 69] = 1
+    grid.update_occupancy()
+    assert grid.row_masks[0] == grid.full_row_mask
+    assert grid.row_masks[1] == 1 << 69
+    assert grid.clearRows() == ClearResult(1, 140)
+    assert np.array_equal(grid.tile_matrix[0], np.eye(1, 70, 69, dtype=np.uint8)[0])
@@ -1,406 +1,40 @@
-import time
-
-from game_grid import GameGrid
+from core.piece import Piece  # the movement of the tetromino without the drawing
+from core.cell import tile_number  # the numbers on the tiles
 from tile import Tile  # used for modeling each tile on the tetromino
-from point import Point  # used for tile positions
-import copy as cp  # the copy module is used for copying tiles and positions
-import random  # module for generating random values/permutations
-import numpy as np  # the fundamental Python module for scientific computing
 
 
-# Class used for modeling tetrominoes with 3 out of 7 different types/shapes
-# as (I, O and Z)
-class Tetromino:
-    # The dimensions of the game grid
-    grid_height, grid_width = None, None
+# Class used for modeling tetrominoes with 7 different types/shapes (the
+# movement is inherited from the Piece class of the core package, this class
+# adds the drawing of the tetromino and of its preview)
+class Tetromino(Piece):
+    # The positions of the tiles in the preview of the next tetromino for each
+    # type (shape) of tetrominoes as (x positions, y positions)
+    preview_positions = {
+        'I': ([14, 14, 14, 14], [4, 3, 2, 1]),
+        'L': ([14, 14, 14, 15], [4, 3, 2, 2]),
+        'J': ([14, 14, 14, 13], [4, 3, 2, 2]),
+        'S': ([13, 14, 14, 15], [3, 3, 4, 4]),
+        'T': ([13, 14, 14, 15], [3, 3, 4, 3]),
+        'O': ([13, 13, 14, 14], [4, 3, 4, 3]),
+        'Z': ([13, 14, 14, 15], [4, 4, 3, 3]),
+    }
 
     # Constructor for creating a tetromino with a given type (shape)
     def __init__(self, type):
-        # set the shape of the tetromino based on the given type
-        self.pre_matrix = None
-        self.type = type
-        # determine the occupied (non-empty) tiles in the tile matrix
-        occupied_tiles = []
-        self.preview_x_pos = []
-        self.preview_y_pos = []
-
-        if type == 'I':
-            n = 4  # n = number of rows = number of columns in the tile matrix
-            # shape of the tetromino I in its initial orientation
-            occupied_tiles.append((1, 0))  # (column_index, row_index)
-            occupied_tiles.append((1, 1))
-            occupied_tiles.append((1, 2))
-            occupied_tiles.append((1, 3))
-
-            self.preview_y_pos = [4, 3, 2, 1]
-            self.preview_x_pos = [14, 14, 14, 14]
-
-        elif type == 'L':
-            n = 3
-            occupied_tiles.append((1, 0))  # (column_index, row_index)
-            occupied_tiles.append((1, 1))
-            occupied_tiles.append((1, 2))
-            occupied_tiles.append((2, 2))
-
-            self.preview_y_pos = [4, 3, 2, 2]
-            self.preview_x_pos = [14, 14, 14, 15]
-
-        elif type == 'J':
-            n = 3
-            occupied_tiles.append((1, 0))  # (column_index, row_index)
-            occupied_tiles.append((1, 1))
-            occupied_tiles.append((1, 2))
-            occupied_tiles.append((0, 2))
-
-            self.preview_x_pos = [14, 14, 14, 13]
-            self.preview_y_pos = [4, 3, 2, 2]
-
-        elif type == 'S':
-            n = 3
-            occupied_tiles.append((1, 0))  # (column_index, row_index)
-            occupied_tiles.append((2, 0))
-            occupied_tiles.append((0, 1))
-            occupied_tiles.append((1, 1))
-
-            self.preview_x_pos = [13, 14, 14, 15]
-            self.preview_y_pos = [3, 3, 4, 4]
-
-        elif type == 'T':
-            n = 3
-            occupied_tiles.append((0, 1))  # (column_index, row_index)
-            occupied_tiles.append((1, 0))
-            occupied_tiles.append((1, 1))
-            occupied_tiles.append((2, 1))
-
-            self.preview_x_pos = [13, 14, 14, 15]
-            self.preview_y_pos = [3, 3, 4, 3]
-
-        elif type == 'O':
-            n = 2  # n = number of rows = number of columns in the tile matrix
-            # shape of the tetromino O in its initial orientation
-            occupied_tiles.append((0, 0))  # (column_index, row_index)
-            occupied_tiles.append((1, 0))
-            occupied_tiles.append((0, 1))
-            occupied_tiles.append((1, 1))
-
-            self.preview_x_pos = [13, 13, 14, 14]
-            self.preview_y_pos = [4, 3, 4, 3]
-
-        elif type == 'Z':
-            n = 3  # n = number of rows = number of columns in the tile matrix
-            # shape of the tetromino Z in its initial orientation
-            occupied_tiles.append((0, 1))  # (column_index, row_index)
-            occupied_tiles.append((1, 1))
-            occupied_tiles.append((1, 2))
-            occupied_tiles.append((2, 2))
-
-            self.preview_x_pos = [13, 14, 14, 15]
-            self.preview_y_pos = [4, 4, 3, 3]
-
-        # create a matrix of numbered tiles based on the shape of the tetromino
-        tile_matrix = np.full((n, n), None)
-        # create the four tiles (minos) of the tetromino and place these tiles
-        # into the tile matrix
-        for i in range(len(occupied_tiles)):
-            col_index, row_index = occupied_tiles[i][0], occupied_tiles[i][1]
-            # create the tile at the computed position
-            tile_matrix[row_index][col_index] = Tile()
-        self.tile_matrix = tile_matrix.copy()
-        self.pre_matrix = tile_matrix.copy()
-        # initialize the position of the tetromino (the bottom left cell in the
-        # tile matrix) with a random horizontal position above the game grid
-        self.bottom_left_cell = Point()
-        self.bottom_left_cell.y = self.grid_height - 1
-        self.bottom_left_cell.x = random.randint(0, self.grid_width - n)
-
-    # Method that returns the position of the cell in the tile matrix specified
-    # by the given row and column indexes
-    def get_cell_position(self, row, col):
-        n = len(self.tile_matrix)  # n = number of rows = number of columns
-        position = Point()
-        # horizontal position of the cell
-        position.x = self.bottom_left_cell.x + col
-        # vertical position of the cell
-        position.y = self.bottom_left_cell.y + (n - 1) - row
-        return position
-
-    # Method that returns a copy of tile_matrix omitting empty rows and columns
-    # and the position of the bottom left cell when return_position is set
-    def get_min_bounded_tile_matrix(self, return_position=False):
-        n = len(self.tile_matrix)  # n = number of rows = number of columns
-        # determine rows and columns to copy (omit empty rows and columns)
-        min_row, max_row, min_col, max_col = n - 1, 0, n - 1, 0
-        for row in range(n):
-            for col in range(n):
-                if self.tile_matrix[row][col] is not None:
-                    if row < min_row:
-                        min_row = row
-                    if row > max_row:
-                        max_row = row
-                    if col < min_col:
-                        min_col = col
-                    if col > max_col:
-                        max_col = col
-        # copy the tiles from the tile matrix and return the resulting copy
-        copy = np.full((max_row - min_row + 1, max_col - min_col + 1), None)
-        for row in range(min_row, max_row + 1):
-            for col in range(min_col, max_col + 1):
-                if self.tile_matrix[row][col] is not None:
-                    row_ind = row - min_row
-                    col_ind = col - min_col
-                    copy[row_ind][col_ind] = cp.deepcopy(self.tile_matrix[row][col])
-        # return just the resulting copy matrix when return_position is not set
-        if not return_position:
-            return copy
-        # otherwise return the position of the bottom left cell in copy as well
-        else:
-            blc_position = cp.copy(self.bottom_left_cell)
-            blc_position.translate(min_col, (n - 1) - max_row)
-            return copy, blc_position
-
-    def merge(self, game_grid):
-        # row = self.grid_height
-        # col = self.grid_width
-        n = len(self.tile_matrix)  # n = number of rows = number of columns
-        for row in range(n):
-            for col in range(n):
-                if self.tile_matrix[row][col] is not None and self.tile_matrix[row - 1][col] is not None:
-
-                    position = self.get_cell_position(row, col)
-                    if position.y == 0 or game_grid.is_occupied(position.y - 1, position.x):
-
-                        if position.y < self.grid_height:
-                            if self.tile_matrix[row][col].number == self.tile_matrix[row - 1][col].number:
-                                self.tile_matrix[row][col].number = 2 * self.tile_matrix[row][col].number
-                                self.tile_matrix[row][col].color()
-                                self.tile_matrix[row - 1][col] = None
+        Piece.__init__(self, type)
+        self.preview_x_pos, self.preview_y_pos = Tetromino.preview_positions[type]
 
     def preview(self):
-        n = len(self.pre_matrix)  # n = number of rows = number of columns
-        position = Point()
-        for i in range(4):
-            position.x = self.preview_x_pos[i]
-            position.y = self.preview_y_pos[i]
-            for row in range(n):
-                for col in range(n):
-                    # draw each occupied tile (not equal to None) on the game grid
-                    if self.pre_matrix[row][col] is not None:
-                        number = self.pre_matrix[row][col].number
-                        self.pre_matrix[row][col].preview(position)
+        # draw a preview tile at each position of the preview
+        Tile.preview_tiles(self.preview_x_pos, self.preview_y_pos)
 
     # Method for drawing the tetromino on the game grid
     def Draw(self):
-        n = len(self.tile_matrix)  # n = number of rows = number of columns
-        for row in range(n):
-            for col in range(n):
-                # draw each occupied tile (not equal to None) on the game grid
-                if self.tile_matrix[row][col] is not None:
-                    # get the position of the tile
-                    position = self.get_cell_position(row, col)
-                    # draw only the tiles that are inside the game grid
-                    if position.y < self.grid_height:
-                        self.tile_matrix[row][col].draw(position)
-
-    # rotate
-    def rotate90Clockwise(self, matrix):
-        N = len(matrix[0])
-        rotated = matrix.copy()
-        for i in range(N // 2):
-            for j in range(i, N - i - 1):
-                temp = rotated[i][j]
-                rotated[i][j] = rotated[N - 1 - j][i]
-                rotated[N - 1 - j][i] = rotated[N - 1 - i][N - 1 - j]
-                rotated[N - 1 - i][N - 1 - j] = rotated[j][N - 1 - i]
-                rotated[j][N - 1 - i] = temp
-        return rotated
-
-    def move(self, direction, game_grid):
-        # check if the tetromino can be moved in the given direction by using the
-        # can_be_moved method defined below
-        if not (self.can_be_moved(direction, game_grid)):
-            return False  # the tetromino cannot be moved in the given direction
-        # move the tetromino by updating the position of the bottom left cell in
-        # the tile matrix
-        if direction == "left":
-            self.bottom_left_cell.x -= 1
-        elif direction == "right":
-            self.bottom_left_cell.x += 1
-        elif direction == "down":
-            self.bottom_left_cell.y -= 1
-        elif direction == "space":
-            x = self.rotate90Clockwise(self.tile_matrix)
-            self.tile_matrix = x
-        return True  # successful move in the given direction
-
-    # Method to check if the tetromino can be moved in the given direction or not
-    def can_be_moved(self, dir, game_grid):
-        n = len(self.tile_matrix)  # n = number of rows = number of columns
-        # check for moving left or right
-        if dir == "left" or dir == "right":
-            for row in range(n):
-                for col in range(n):
-                    # direction = left --> check the leftmost tile of each row
-                    if dir == "left" and self.tile_matrix[row][col] is not None:
-                        leftmost = self.get_cell_position(row, col)
-                        # tetromino cannot go left if any leftmost tile is at x = 0
-                        if leftmost.x == 0:
-                            return False
-                        # skip each row whose leftmost tile is out of the game grid
-                        # (possible for newly entered tetrominoes to the game grid)
-                        if leftmost.y >= self.grid_height:
-                            break
-                        # the tetromino cannot go left if the grid cell on the left of
-                        # any leftmost tile is occupied
-                        if game_grid.is_occupied(leftmost.y, leftmost.x - 1):
-                            return False
-                        break  # end the inner for loop
-                    # direction = right --> check the rightmost tile of each row
-                    elif dir == "right" and self.tile_matrix[row][n - 1 - col] is not None:
-                        rightmost = self.get_cell_position(row, n - 1 - col)
-                        # the tetromino cannot go right if any rightmost tile is at
-                        # x = grid_width - 1
-                        if rightmost.x == self.grid_width - 1:
-                            return False
-                        # skip each row whose rightmost tile is out of the game grid
-                        # (possible for newly entered tetrominoes to the game grid)
-                        if rightmost.y >= self.grid_height:
-                            break
-                        # the tetromino cannot go right if the grid cell on the right
-                        # of any rightmost tile is occupied
-                        if game_grid.is_occupied(rightmost.y, rightmost.x + 1):
-                            return False
-                        break  # end the inner for loop
-        # direction = down --> check the bottommost tile of each column
-        elif dir == "down":
-            for col in range(n):
-                for row in range(n - 1, -1, -1):
-                    if self.tile_matrix[row][col] is not None:
-                        bottommost = self.get_cell_position(row, col)
-                        # skip each column whose bottommost tile is out of the grid
-                        # (possible for newly entered tetrominoes to the game grid)
-                        if bottommost.y > self.grid_height:
-                            break
-                        # tetromino cannot go down if any bottommost tile is at y = 0
-                        if bottommost.y == 0:
-                            return False
-                            # or the grid cell below any bottommost tile is occupied
-                        if game_grid.is_occupied(bottommost.y - 1, bottommost.x):
-                            return False
-                        break  # end the inner for loop
-        else:
-            if self.type == 'I':
-                for row in range(n):
-                    for col in range(n):
-                        # direction = left --> check the leftmost tile of each row
-                        if self.tile_matrix[row][col] is not None:
-                            leftmost = self.get_cell_position(row, col)
-                            # tetromino cannot go left if any leftmost tile is at x = 0
-                            if leftmost.x == 0 or leftmost.x == 1:
-                                return False
-                            # skip each row whose leftmost tile is out of the game grid
-                            # (possible for newly entered tetrominoes to the game grid)
-                            if leftmost.y >= self.grid_height:
-                                break
-                            # the tetromino cannot go left if the grid cell on the left of
-                            # any leftmost tile is occupied
-                            if game_grid.is_occupied(leftmost.y, leftmost.x - 1):
-                                return False
-                            if game_grid.is_occupied(leftmost.y, leftmost.x - 2):
-                                return False
-                            break  # end the inner for loop
-                for row in range(n):
-                    for col in range(n):
-                        # direction = right --> check the rightmost tile of each row
-                        if self.tile_matrix[row][n - 1 - col] is not None:
-                            rightmost = self.get_cell_position(row, n - 1 - col)
-                            # the tetromino cannot go right if any rightmost tile is at
-                            # x = grid_width - 1
-                            if rightmost.x == self.grid_width - 1 or rightmost.x == self.grid_width - 2:
-                                return False
-                            # skip each row whose rightmost tile is out of the game grid
-                            # (possible for newly entered tetrominoes to the game grid)
-                            if rightmost.y >= self.grid_height:
-                                break
-                            # the tetromino cannot go right if the grid cell on the right
-                            # of any rightmost tile is occupied
-                            if game_grid.is_occupied(rightmost.y, rightmost.x + 1):
-                                return False
-                            if game_grid.is_occupied(rightmost.y, rightmost.x + 2):
-                                return False
-                            break  # end the inner for loop
-
-                    # direction = down --> check the bottommost tile of each column
-                for col in range(n):
-                    for row in range(n - 1, -1, -1):
-                        if self.tile_matrix[row][col] is not None:
-                            bottommost = self.get_cell_position(row, col)
-                            # skip each column whose bottommost tile is out of the grid
-                            # (possible for newly entered tetrominoes to the game grid)
-                            if bottommost.y > self.grid_height:
-                                break
-                            # tetromino cannot go down if any bottommost tile is at y = 0
-                            if bottommost.y == 0:
-                                return False
-                                # or the grid cell below any bottommost tile is occupied
-                            if game_grid.is_occupied(bottommost.y - 1, bottommost.x):
-                                return False
-                            break  # end the inner for loop
-
-            elif self.type == "O":
-                return True
-
-            else:
-                for row in range(n):
-                    for col in range(n):
-                        # direction = left --> check the leftmost tile of each row
-                        if self.tile_matrix[row][col] is not None:
-                            leftmost = self.get_cell_position(row, col)
-                            # tetromino cannot go left if any leftmost tile is at x = 0
-                            if leftmost.x == 0:
-                                return False
-                            # skip each row whose leftmost tile is out of the game grid
-                            # (possible for newly entered tetrominoes to the game grid)
-                            if leftmost.y >= self.grid_height:
-                                break
-                            # the tetromino cannot go left if the grid cell on the left of
-                            # any leftmost tile is occupied
-                            if game_grid.is_occupied(leftmost.y, leftmost.x - 1):
-                                return False
-                            break  # end the inner for loop
-                for row in range(n):
-                    for col in range(n):
-                        # direction = right --> check the rightmost tile of each row
-                        if self.tile_matrix[row][n - 1 - col] is not None:
-                            rightmost = self.get_cell_position(row, n - 1 - col)
-                            # the tetromino cannot go right if any rightmost tile is at
-                            # x = grid_width - 1
-                            if rightmost.x == self.grid_width - 1:
-                                return False
-                            # skip each row whose rightmost tile is out of the game grid
-                            # (possible for newly entered tetrominoes to the game grid)
-                            if rightmost.y >= self.grid_height:
-                                break
-                            # the tetromino cannot go right if the grid cell on the right
-                            # of any rightmost tile is occupied
-                            if game_grid.is_occupied(rightmost.y, rightmost.x + 1):
-                                return False
-                            break  # end the inner for loop
-
-                    # direction = down --> check the bottommost tile of each column
-                for col in range(n):
-                    for row in range(n - 1, -1, -1):
-                        if self.tile_matrix[row][col] is not None:
-                            bottommost = self.get_cell_position(row, col)
-                            # skip each column whose bottommost tile is out of the grid
-                            # (possible for newly entered tetrominoes to the game grid)
-                            if bottommost.y > self.grid_height:
-                                break
-                            # tetromino cannot go down if any bottommost tile is at y = 0
-                            if bottommost.y == 0:
-                                return False
-                                # or the grid cell below any bottommost tile is occupied
-                            if game_grid.is_occupied(bottommost.y - 1, bottommost.x):
-                                return False
-                            break  # end the inner for loop
-
-        return True  # tetromino can be moved in the given direction
+        xs, ys, numbers = [], [], []
+        for position, value in self.get_tiles():
+            # draw only the tiles that are inside the game grid
+            if position.y < self.grid_height:
+                xs.append(position.x)
+                ys.append(position.y)
+                numbers.append(tile_number(value))
+        Tile.draw_tiles(xs, ys, numbers)
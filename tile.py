@@ -1,10 +1,12 @@
-import random
-
 import lib.stddraw as stddraw  # stddraw is used as a basic graphics library
-from lib.color import Color  # used for coloring the tile and the number on it
+import palette  # the shared colors of the tiles
+from point import Point  # used for the positions of the batched tiles
+import numpy as np  # used for the positions of the batched tiles
 
 
-# Class used for modeling numbered tiles as in 2048
+# Class used for drawing numbered tiles as in 2048 (the game grid and the
+# tetrominoes only store the values of their tiles, see core/cell.py, and the
+# Tile objects are created from these values when they are drawn)
 class Tile:
     # Class attributes shared among all Tile objects
     # ---------------------------------------------------------------------------
@@ -13,23 +15,37 @@ class Tile:
     # font family and size used for displaying the tile number
     font_family, font_size = "Arial", 14
 
-    # Constructor that creates a tile with 2 or 4 as the number on it
-    def __init__(self):
+    # Constructor that creates a tile with the given number on it
+    def __init__(self, number=2):
         # set the number on the tile
-        numbers = [2, 4]
-        random_index = random.randint(0, 1)
-        self.number = numbers[random_index]
-        # set the colors of the tile
-        if self.number == 2:
-            self.background_color = Color(238, 228, 218)  # background (tile) color
-        elif self.number == 4:
-            self.background_color = Color(238, 217, 177)
-        self.foreground_color = Color(0, 100, 200)  # foreground (number) color
-        self.box_color = Color(0, 100, 200)  # box (boundary) color
-
-    # Method for drawing the tile
+        self.number = number
+        # set the colors of the tile (shared colors looked up by the tile value
+        # log2(number), see palette.py)
+        self.background_color = palette.tile_color(number.bit_length() - 1)
+        self.foreground_color = palette.TILE_NUMBER_COLOR  # number color
+        self.box_color = palette.TILE_BOX_COLOR  # box (boundary) color
 
+    # Method for drawing the tile (the tile is rendered once for each number and
+    # length, and the cached sprite is reused for the next tiles, see
+    # stddraw.sprite)
     def draw(self, position, length=1):
+        stddraw.sprite(("tile", self.number, length), position.x - length / 2,
+                       position.y - length / 2, length, length,
+                       lambda: self.draw_shapes(position, length))
+
+    # Method for drawing the tiles with the given numbers centered at the given
+    # x and y positions (arrays of the same length) with a single batched call
+    # (see stddraw.sprites), e.g. all the tiles on the game grid
+    @staticmethod
+    def draw_tiles(xs, ys, numbers, length=1):
+        keys = [("tile", number, length) for number in numbers]
+        stddraw.sprites(keys, np.asarray(xs) - length / 2,
+                        np.asarray(ys) - length / 2, length, length,
+                        lambda i: Tile(numbers[i]).draw_shapes(
+                            Point(xs[i], ys[i]), length))
+
+    # Method for drawing the shapes and the number of the tile
+    def draw_shapes(self, position, length=1):
         # draw the tile as a filled square
         stddraw.setPenColor(self.background_color)
         stddraw.filledSquare(position.x, position.y, length / 2)
@@ -44,9 +60,26 @@ class Tile:
         stddraw.setFontSize(Tile.font_size)
         stddraw.text(position.x, position.y, str(self.number))
 
+    # Method for drawing the tile in the preview of the next tetromino (by using
+    # a cached sprite as in the draw method)
     def preview(self, position, length=1):
+        stddraw.sprite(("preview", length), position.x - length / 2,
+                       position.y - length / 2, length, length,
+                       lambda: self.preview_shapes(position, length))
+
+    # Method for drawing the preview tiles centered at the given x and y
+    # positions with a single batched call (see stddraw.sprites)
+    @staticmethod
+    def preview_tiles(xs, ys, length=1):
+        keys = [("preview", length)] * len(xs)
+        stddraw.sprites(keys, np.asarray(xs) - length / 2,
+                        np.asarray(ys) - length / 2, length, length,
+                        lambda i: Tile().preview_shapes(Point(xs[i], ys[i]), length))
+
+    # Method for drawing the shapes of the tile in the preview
+    def preview_shapes(self, position, length=1):
         # draw the tile as a filled square
-        stddraw.setPenColor(Color(61, 239, 215))
+        stddraw.setPenColor(palette.PREVIEW_TILE_COLOR)
         stddraw.filledSquare(position.x, position.y, length / 2)
         # draw the bounding box around the tile as a square
         stddraw.setPenColor(self.box_color)